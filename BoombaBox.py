@@ -1,8 +1,21 @@
 import sys
 import os
 import random
+import re
 import json
-from datetime import datetime
+import queue
+import base64
+import hashlib
+import time
+import math
+import operator
+import unicodedata
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict, deque
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from datetime import datetime, timedelta
 
 try:
     import vlc
@@ -12,7 +25,8 @@ except ImportError:
 
 try:
     from mutagen import File
-    from mutagen.id3 import ID3, APIC
+    from mutagen.id3 import TCON
+    from mutagen.flac import Picture
 except ImportError:
     print("Error: mutagen not installed. Run: pip install mutagen")
     sys.exit(1)
@@ -22,12 +36,15 @@ try:
         QApplication, QWidget, QVBoxLayout, QHBoxLayout,
         QListWidget, QPushButton, QLabel, QLineEdit,
         QTabWidget, QSplitter, QSlider, QStyle,
-        QScrollArea, QGridLayout, QFrame, QFileDialog,
+        QListView, QStyledItemDelegate, QFrame, QFileDialog,
         QMessageBox, QComboBox, QInputDialog, QDialog,
-        QListWidgetItem, QMenu, QAction
+        QListWidgetItem, QMenu, QAction, QProgressBar, QSpinBox
     )
-    from PyQt5.QtCore import Qt, QTimer, QSize, pyqtSignal
-    from PyQt5.QtGui import QPixmap, QImage, QFont, QColor, QCursor
+    from PyQt5.QtCore import (
+        Qt, QObject, QEvent, QTimer, QSize, QRect, QPoint, QThread, QFileSystemWatcher,
+        QRunnable, QThreadPool, QAbstractListModel, QModelIndex, QPersistentModelIndex, pyqtSignal
+    )
+    from PyQt5.QtGui import QPixmap, QImage, QFont, QColor, QCursor, QPainter
 except ImportError:
     print("Error: PyQt5 not installed. Run: pip install PyQt5")
     sys.exit(1)
@@ -36,48 +53,1168 @@ except ImportError:
 MUSIC_DIR = "music"
 PLAYLISTS_FILE = "playlists.json"
 SETTINGS_FILE = "settings.json"
+LIBRARY_INDEX_FILE = "library_index.json"
+THUMBNAIL_DIR = "thumbnails"
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".flac", ".ogg", ".m4a", ".aac")
 
 
-def scan_music_folder(folder):
-    """Scan music folder and extract metadata"""
-    songs = []
+class LibraryIndex:
+    """Persistent path -> metadata index so rescans only parse new or changed files"""
+    VERSION = 4
+    UPGRADABLE = (3,)  # Older formats that only lack the derived sort and search keys
+
+    def __init__(self, path=LIBRARY_INDEX_FILE):
+        self.path = path
+        self.entries = {}
+        self.stats = {}
+        self.load()
+
+    def load(self):
+        """Load index from file, discarding it if the format changed"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        version = data.get("version")
+        if version != self.VERSION and version not in self.UPGRADABLE:
+            return
+        self.entries = data.get("entries", {})
+        self.stats = data.get("stats", {})
+        for entry in self.entries.values():
+            if version != self.VERSION:
+                add_track_keys(entry)
+            self._intern(entry)
+
+    @staticmethod
+    def _intern(entry):
+        """Share one string object per distinct artist, album, genre and art hash"""
+        for key in ("artist", "album", "genre", "art_hash", "artist_key", "album_key"):
+            if entry.get(key):
+                entry[key] = sys.intern(entry[key])
+
+    def save(self):
+        """Save index to file"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.VERSION, "stats": self.stats, "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+    def lookup(self, path, st):
+        """Return the cached entry for path if the file is unchanged since it was indexed"""
+        entry = self.entries.get(path)
+        if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry
+        return None
+
+    def store(self, path, st, meta):
+        """Record freshly parsed metadata for path"""
+        entry = dict(meta, mtime=st.st_mtime_ns, size=st.st_size)
+        self._intern(entry)
+        self.entries[path] = entry
+        return entry
+
+    def prune(self, seen):
+        """Drop entries for files that no longer exist, returning how many were removed"""
+        stale = [path for path in self.entries if path not in seen]
+        for path in stale:
+            del self.entries[path]
+        return len(stale)
+
+
+# Text tag keys per tag format: ID3 frames, Vorbis comments (FLAC/OGG) and MP4 atoms
+TAG_KEYS = {
+    "title": ("TIT2", "title", "\xa9nam"),
+    "artist": ("TPE1", "artist", "\xa9ART"),
+    "album": ("TALB", "album", "\xa9alb"),
+    "genre": ("TCON", "genre", "\xa9gen"),
+}
+
+
+def _tag_text(tags, keys):
+    """Return the first text value stored under any of keys, or None"""
+    for key in keys:
+        try:
+            value = tags[key]
+        except (KeyError, ValueError, TypeError):
+            continue
+        if isinstance(value, TCON):
+            value = value.genres
+        elif hasattr(value, "text"):
+            value = value.text
+        if isinstance(value, (list, tuple)):
+            value = value[0] if value else None
+        if value:
+            return str(value)
+    return None
+
+
+def _find_art(audio):
+    """Return the raw bytes of the first embedded picture of a parsed file, or None"""
+    pictures = getattr(audio, "pictures", None)  # FLAC
+    if pictures:
+        return pictures[0].data
+    tags = audio.tags
+    if not tags:
+        return None
+    if hasattr(tags, "getall"):  # ID3
+        frames = tags.getall("APIC")
+        return frames[0].data if frames else None
+    covers = tags.get("covr")  # MP4
+    if covers:
+        return bytes(covers[0])
+    blocks = tags.get("metadata_block_picture")  # OGG
+    if blocks:
+        try:
+            return Picture(base64.b64decode(blocks[0])).data
+        except Exception:
+            return None
+    return None
+
+
+SEARCH_FIELDS = ("title", "artist", "album", "genre")
+NUMBER_RUN = re.compile(r"\d+")
+
+
+def search_key(text):
+    """Casefold text, strip accents and collapse whitespace for matching"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join("".join(c for c in text if not unicodedata.combining(c)).split())
+
+
+def _natural_number(match):
+    # Prefix each number with its length so "2" sorts before "10"
+    digits = match.group().lstrip("0") or "0"
+    return chr(0x30 + len(digits)) + digits
+
+
+def sort_key(text):
+    """Order text ignoring case, accents and a leading "The", comparing numbers by value"""
+    key = search_key(text)
+    if key.startswith("the "):
+        key = key[4:]
+    return NUMBER_RUN.sub(_natural_number, key)
+
+
+def add_track_keys(meta):
+    """Add precomputed sort keys and the search text to song metadata"""
+    meta["title_key"] = sort_key(meta["title"])
+    meta["artist_key"] = sort_key(meta["artist"])
+    meta["album_key"] = sort_key(meta["album"])
+    meta["search_text"] = "\n" + "\n".join(search_key(meta[field]) for field in SEARCH_FIELDS)
+    return meta
+
+
+def read_song_metadata(path):
+    """Parse text tags, album art and stream info of a file, opening it only once"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    audio = File(path)
+    tags = audio.tags if audio is not None and audio.tags else {}
+    info = audio.info if audio is not None else None
+    art_data = _find_art(audio) if audio is not None else None
+
+    return add_track_keys({
+        "title": _tag_text(tags, TAG_KEYS["title"]) or name,
+        "artist": _tag_text(tags, TAG_KEYS["artist"]) or "Unknown Artist",
+        "album": _tag_text(tags, TAG_KEYS["album"]) or "Unknown Album",
+        "genre": _tag_text(tags, TAG_KEYS["genre"]) or "Unknown Genre",
+        "art_hash": hashlib.sha1(art_data).hexdigest() if art_data else None,
+        "duration": round(getattr(info, "length", 0) or 0, 3),
+        "bitrate": getattr(info, "bitrate", 0) or 0,
+        "sample_rate": getattr(info, "sample_rate", 0) or 0
+    })
+
+
+def load_album_art(path):
+    """Load embedded album art of a file as a QImage"""
+    try:
+        audio = File(path)
+    except Exception:
+        return None
+    art_data = _find_art(audio) if audio is not None else None
+    return QImage.fromData(art_data) if art_data else None
+
+
+class AlbumArtCache:
+    """Size-bounded LRU cache of decoded album art, loaded on first use"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._missing = set()  # Keys whose art would not load, so it is not retried
+
+    def get(self, key, load):
+        """Return the image cached under key, calling load() to produce it on a miss"""
+        found, image = self.lookup(key)
+        if found:
+            return image
+        return self.store(key, load())
+
+    def lookup(self, key):
+        """Return (True, image) if key is cached, image being None for art known to be missing, else (False, None)"""
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            self.hits += 1
+            return True, image
+        if key in self._missing:
+            self.hits += 1
+            return True, None
+        return False, None
+
+    def store(self, key, image):
+        """Cache an image loaded for key after a lookup missed, or remember that it would not load"""
+        if key in self._images:  # Loaded twice, e.g. by paint and by a background job
+            return self._images[key]
+        self.misses += 1
+        if image is None or image.isNull():
+            self._missing.add(key)
+            return None
+        size = image.sizeInBytes()
+        if size <= self.max_bytes:
+            while self.used_bytes + size > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.used_bytes -= evicted.sizeInBytes()
+            self._images[key] = image
+            self.used_bytes += size
+        return image
+
+
+class MediaCache:
+    """Count-bounded LRU cache of parsed vlc.Media objects, keyed by file path"""
+
+    def __init__(self, instance, max_items):
+        self.instance = instance
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self.released = 0
+        self._media = OrderedDict()
+        self._spares = {}  # Second media for a path whose cached one is busy (repeat one)
+
+    def __len__(self):
+        return len(self._media)
+
+    def get(self, path):
+        """Return the media for path, creating it and starting a parse on a miss"""
+        media = self._media.get(path)
+        if media is not None:
+            self._media.move_to_end(path)
+            self.hits += 1
+            return media
+
+        self.misses += 1
+        media = self.instance.media_new(path)
+        media.parse_with_options(vlc.MediaParseFlag.local, 0)
+        self._media[path] = media
+        while len(self._media) > self.max_items:
+            evicted_path, evicted = self._media.popitem(last=False)
+            evicted.release()
+            self.released += 1
+            self._release_spare(evicted_path)
+        return media
+
+    def get_idle(self, path, busy):
+        """Return a media for path other than busy, keeping one spare besides the cached one"""
+        media = self.get(path)
+        if media is not busy:
+            return media
+        spare = self._spares.get(path)
+        if spare is None:
+            spare = self._spares[path] = self.instance.media_new(path)
+            spare.parse_with_options(vlc.MediaParseFlag.local, 0)
+        return spare
+
+    def discard(self, path):
+        """Drop the media for path, e.g. because the file changed or went away"""
+        media = self._media.pop(path, None)
+        if media is not None:
+            media.release()
+            self.released += 1
+        self._release_spare(path)
+
+    def _release_spare(self, path):
+        spare = self._spares.pop(path, None)
+        if spare is not None:
+            spare.release()
+            self.released += 1
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ThumbnailCache:
+    """On-disk cache of pre-scaled album art, keyed by the art's content hash"""
+
+    def __init__(self, folder=THUMBNAIL_DIR):
+        self.folder = folder
+        self.created = 0
+
+    def load(self, song, width, height):
+        """Load the thumbnail of a song's art, creating it from the file if needed"""
+        path = os.path.join(self.folder, f"{song.art_hash}_{width}x{height}.jpg")
+        if os.path.exists(path):
+            image = QImage(path)
+            if not image.isNull():
+                return image
+
+        art = load_album_art(song.file)
+        if art is None or art.isNull():
+            return None
+        thumb = art.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            if thumb.save(path + ".tmp", "JPEG", 85):
+                os.replace(path + ".tmp", path)
+                self.created += 1
+        except OSError as e:
+            print(f"Error saving thumbnail {path}: {e}")
+        return thumb
+
+
+class ThumbnailJob(QRunnable):
+    """Creates one album art thumbnail on a QThreadPool thread and reports it through done"""
+
+    def __init__(self, cache, song, width, height, done):
+        super().__init__()
+        self.cache = cache
+        self.song = song
+        self.width = width
+        self.height = height
+        self.done = done  # Signal(key, image), delivered on the GUI thread
+
+    def run(self):
+        image = self.cache.load(self.song, self.width, self.height)
+        self.done.emit((self.song.art_hash, self.width, self.height), image)
+
+
+class Track:
+    """Library song record"""
+    __slots__ = (
+        "id", "title", "artist", "album", "genre", "file", "art_hash", "duration", "plays",
+        "title_key", "artist_key", "album_key", "search_text"
+    )
+
+    def __init__(self, path, entry, plays=0):
+        self.id = -1  # Assigned when the track joins the library
+        self.file = path
+        self.plays = plays
+        self.update_metadata(entry)
+
+    def update_metadata(self, entry):
+        """Take tags, art and duration from indexed or freshly parsed metadata"""
+        self.title = entry["title"]
+        self.artist = sys.intern(entry["artist"])
+        self.album = sys.intern(entry["album"])
+        self.genre = sys.intern(entry["genre"])
+        self.art_hash = sys.intern(entry["art_hash"]) if entry["art_hash"] else None
+        self.duration = entry.get("duration", 0)
+        self.title_key = entry["title_key"]
+        self.artist_key = sys.intern(entry["artist_key"])
+        self.album_key = sys.intern(entry["album_key"])
+        self.search_text = entry["search_text"]
+
+
+NUMERIC_FIELDS = ("plays", "duration")
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _term_in(term, haystack):
+    """Check one query term against newline-prefixed search text"""
+    if term.endswith("*"):
+        prefix = term[:-1]
+        return "\n" + prefix in haystack or " " + prefix in haystack
+    return term in haystack
+
+
+class SearchIndex:
+    """Token and trigram index over the searchable fields of tracks"""
+
+    SCAN_DIVISOR = 4  # Index lookups that touch more than 1/4 of the library fall back to a scan
+
+    def __init__(self):
+        self.tracks = {}  # track id -> track
+        self.values = {field: {} for field in SEARCH_FIELDS}  # value -> set of track ids
+        self.grams = {field: {} for field in SEARCH_FIELDS}  # trigram -> set of values
+        self.tokens = {field: {} for field in SEARCH_FIELDS}  # token -> set of values
+        self.haystacks = {}  # track id -> search text
+        self._sorted_tokens = {}
+        self._sorted_numbers = {}
+
+    def add(self, track):
+        """Index a track's fields"""
+        for field, value in zip(SEARCH_FIELDS, track.search_text[1:].split("\n")):
+            ids = self.values[field].get(value)
+            if ids is None:
+                ids = self.values[field][value] = set()
+                for gram in _trigrams(value):
+                    self.grams[field].setdefault(gram, set()).add(value)
+                for token in value.split():
+                    self.tokens[field].setdefault(token, set()).add(value)
+                self._sorted_tokens.pop(field, None)
+            ids.add(track.id)
+        self.tracks[track.id] = track
+        self.haystacks[track.id] = track.search_text
+        self._sorted_numbers.clear()
+
+    def remove(self, track):
+        """Drop a track from the index; call before changing its fields"""
+        for field, value in zip(SEARCH_FIELDS, track.search_text[1:].split("\n")):
+            ids = self.values[field].get(value)
+            if ids is None:
+                continue
+            ids.discard(track.id)
+            if ids:
+                continue
+            del self.values[field][value]
+            for postings, keys in ((self.grams[field], _trigrams(value)), (self.tokens[field], value.split())):
+                for key in keys:
+                    postings[key].discard(value)
+                    if not postings[key]:
+                        del postings[key]
+            self._sorted_tokens.pop(field, None)
+        self.tracks.pop(track.id, None)
+        self.haystacks.pop(track.id, None)
+        self._sorted_numbers.clear()
+
+    def numbers_changed(self, field):
+        """Forget the sorted array of a numeric field after tracks changed it, e.g. plays"""
+        self._sorted_numbers.pop(field, None)
+
+    def scan_limit(self):
+        return max(len(self.haystacks) // self.SCAN_DIVISOR, 64)
+
+    def _token_postings(self, term, field):
+        """Return the value sets of every token matching a prefix or short term"""
+        postings = self.tokens[field]
+        if not term.endswith("*"):
+            return [postings[token] for token in postings if term in token]
+        prefix = term[:-1]
+        tokens = self._sorted_tokens.get(field)
+        if tokens is None:
+            tokens = self._sorted_tokens[field] = sorted(postings)
+        matched = []
+        for i in range(bisect_left(tokens, prefix), len(tokens)):
+            if not tokens[i].startswith(prefix):
+                break
+            matched.append(postings[tokens[i]])
+        return matched
+
+    def lookup(self, term, fields=SEARCH_FIELDS, limit=None):
+        """Return ids of tracks where term matches one of fields, or None past limit field values"""
+        cost = 0
+        plans = []
+        for field in fields:
+            if term.endswith("*") or len(term) < 3:
+                postings = self._token_postings(term, field)
+                cost += sum(map(len, postings))
+                plans.append((field, postings))
+            else:
+                postings = [self.grams[field].get(gram) for gram in _trigrams(term)]
+                if not all(postings):
+                    continue
+                postings.sort(key=len)
+                cost += len(postings[0])
+                plans.append((field, postings))
+            if limit is not None and cost > limit:
+                return None
+
+        matched = []
+        for field, postings in plans:
+            if term.endswith("*") or len(term) < 3:
+                candidates = set().union(*postings)
+            else:
+                candidates = postings[0].intersection(*postings[1:])
+                if len(term) > 3:
+                    candidates = [value for value in candidates if term in value]
+            values = self.values[field]
+            matched.extend([values[value] for value in candidates])
+        return set().union(*matched)
+
+    def scan(self, term, candidates=None, field=None):
+        """Return ids among candidates, or all tracks, whose search text (or field line) matches term"""
+        if candidates is None:
+            items = self.haystacks.items()
+        else:
+            haystacks = self.haystacks
+            items = ((i, haystacks[i]) for i in candidates)
+        if field is not None:
+            line = SEARCH_FIELDS.index(field) + 1
+            return {i for i, haystack in items if _term_in(term, "\n" + haystack.split("\n")[line])}
+        if term.endswith("*"):
+            line, word = "\n" + term[:-1], " " + term[:-1]
+            return {i for i, haystack in items if line in haystack or word in haystack}
+        return {i for i, haystack in items if term in haystack}
+
+    def range(self, field, op, number):
+        """Return ids of tracks whose numeric field compares to number with op"""
+        numbers = self._sorted_numbers.get(field)
+        if numbers is None:
+            order = sorted(self.tracks.values(), key=lambda t: getattr(t, field))
+            numbers = self._sorted_numbers[field] = ([getattr(t, field) for t in order], [t.id for t in order])
+        keys, ids = numbers
+        if op == ">":
+            return set(ids[bisect_right(keys, number):])
+        if op == ">=":
+            return set(ids[bisect_left(keys, number):])
+        if op == "<":
+            return set(ids[:bisect_left(keys, number)])
+        if op == "<=":
+            return set(ids[:bisect_right(keys, number)])
+        return set(ids[bisect_left(keys, number):bisect_right(keys, number)])
+
+
+class SearchQuery:
+    """A parsed library search, e.g. artist:kaytranada plays:>5 -title:remix"""
+
+    TOKEN = re.compile(r'(-)?(?:([a-z]+):)?(?:"([^"]*)"?|(\S+))', re.IGNORECASE)
+    COMPARISON = re.compile(r"(>=|<=|>|<|=)?(\d+:\d{1,2}|\d+(?:\.\d+)?)$")
+    COMPARE = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "=": operator.eq}
+
+    def __init__(self, text):
+        self.text = text
+        self.clauses = []
+        for match in self.TOKEN.finditer(text):
+            negate, field, phrase, word = match.groups()
+            if word and word.endswith(":") and word[:-1].lower() in SEARCH_FIELDS + NUMERIC_FIELDS:
+                continue  # A field qualifier still waiting for its value
+            field = field.lower() if field else None
+            if field and field not in SEARCH_FIELDS and field not in NUMERIC_FIELDS:
+                # Not a field we know, e.g. a colon inside a title
+                field, phrase, word = None, None, match.group(0)[1 if negate else 0:]
+            value = phrase if phrase is not None else word
+            if field in NUMERIC_FIELDS:
+                comparison = self.COMPARISON.match(value)
+                if comparison:  # Half-typed comparisons are ignored rather than matching nothing
+                    op, number = comparison.groups()
+                    minutes, _, seconds = number.rpartition(":")
+                    number = int(minutes) * 60 + int(seconds) if minutes else float(number)
+                    self.clauses.append((field, None, op or "=", number, bool(negate)))
+                continue
+            term = search_key(value)
+            if term:
+                self.clauses.append((field, term, None, None, bool(negate)))
+
+    def __bool__(self):
+        return bool(self.clauses)
+
+    def refines(self, other):
+        """Whether every match of this query also matches other, so other's results can be narrowed"""
+        if other is None or not other.clauses or len(self.clauses) < len(other.clauses):
+            return False
+        for new, old in zip(self.clauses, other.clauses):
+            if new == old:
+                continue
+            if new[0] != old[0] or new[1] is None or old[1] is None or new[4] or old[4]:
+                return False
+            if old[1].endswith("*"):
+                if not (new[1].endswith("*") and new[1].startswith(old[1][:-1])):
+                    return False
+            elif old[1] not in new[1].rstrip("*"):
+                return False
+        return True
+
+    def matches(self, track):
+        """Check a single track against the query without using the index"""
+        for field, term, op, number, negate in self.clauses:
+            if op:
+                found = self.COMPARE[op](getattr(track, field), number)
+            elif field:
+                line = track.search_text.split("\n")[SEARCH_FIELDS.index(field) + 1]
+                found = _term_in(term, "\n" + line)
+            else:
+                found = _term_in(term, track.search_text)
+            if found == negate:
+                return False
+        return True
+
+    def run(self, index, within=None):
+        """Return ids of tracks matching the query, within a known superset if given, or None without clauses"""
+        if not self.clauses:
+            return None
+        limit = index.scan_limit()
+        positive = sorted(
+            (clause for clause in self.clauses if not clause[4]),
+            key=lambda clause: (clause[0] is None, -len(clause[1] or ""))
+        )
+        result = within
+        deferred = []
+        for field, term, op, number, _ in positive:
+            if op:
+                ids = index.range(field, op, number)
+            elif (" " in term and term.endswith("*")) or (result is not None and len(result) <= limit):
+                # Prefix terms go through the token postings, which only hold single words
+                deferred.append((term, field))
+                continue
+            elif field:
+                ids = index.lookup(term, (field,))
+            else:
+                ids = index.lookup(term, limit=limit)
+                if ids is None:
+                    deferred.append((term, field))
+                    continue
+            result = ids if result is None else result & ids
+            if not result:
+                return result
+        for term, field in deferred:
+            result = index.scan(term, result, field)
+
+        if result is None:
+            result = set(index.tracks)
+        for field, term, op, number, negate in self.clauses:
+            if not negate or not result:
+                continue
+            # Not -=: result may still be the caller's within set
+            if op:
+                result = result - index.range(field, op, number)
+            else:
+                result = result - index.scan(term, result, field)
+        return result
+
+
+FACET_FIELDS = ("artist", "album", "genre")
+BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def ids_to_bitmap(ids):
+    """Pack track ids into an int with bit i set for id i"""
+    if not ids:
+        return 0
+    flags = bytearray((max(ids) >> 3) + 1)
+    for i in ids:
+        flags[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(flags, "little")
+
+
+def bitmap_to_ids(bits):
+    """Unpack an id bitmap into a set of track ids"""
+    ids = set()
+    data = bits.to_bytes((bits.bit_length() + 7) >> 3, "little")
+    for offset, byte in enumerate(data):
+        if byte:
+            base = offset << 3
+            ids.update([base + bit for bit in BYTE_BITS[byte]])
+    return ids
+
+
+class FacetIndex:
+    """Track ids per artist, album and genre value, for the Browse tab"""
+
+    def __init__(self):
+        self.facets = {field: {} for field in FACET_FIELDS}  # value -> set of track ids
+        self._sorted = {}
+        self._bitmaps = {}  # (field, value) -> bitmap of the value's ids
+
+    def add(self, track):
+        for field in FACET_FIELDS:
+            value = getattr(track, field)
+            ids = self.facets[field].get(value)
+            if ids is None:
+                ids = self.facets[field][value] = set()
+                self._sorted.pop(field, None)
+            ids.add(track.id)
+            self._bitmaps.pop((field, value), None)
+
+    def remove(self, track):
+        """Drop a track; call before changing its fields"""
+        for field in FACET_FIELDS:
+            value = getattr(track, field)
+            ids = self.facets[field].get(value)
+            if ids is None:
+                continue
+            ids.discard(track.id)
+            self._bitmaps.pop((field, value), None)
+            if not ids:
+                del self.facets[field][value]
+                self._sorted.pop(field, None)
+
+    def ids(self, field, value):
+        """Return the ids of tracks with the given field value"""
+        return self.facets[field].get(value, set())
+
+    def bitmap(self, field, values):
+        """Return a bitmap of tracks having any of values in field"""
+        bits = 0
+        for value in values:
+            value_bits = self._bitmaps.get((field, value))
+            if value_bits is None:
+                value_bits = self._bitmaps[(field, value)] = ids_to_bitmap(self.ids(field, value))
+            bits |= value_bits
+        return bits
+
+    def counts(self, field, within=None):
+        """Return (value, track count) pairs for a field in sort order, counting only ids within"""
+        values = self._sorted.get(field)
+        if values is None:
+            values = self._sorted[field] = sorted(self.facets[field], key=sort_key)
+        facet = self.facets[field]
+        if within is None:
+            return [(value, len(facet[value])) for value in values]
+        return [(value, len(facet[value].intersection(within))) for value in values]
+
+
+def _parse_song_file(path):
+    """Worker entry point: parse one file, reporting errors instead of raising"""
+    try:
+        return read_song_metadata(path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def list_music_files(folder, cancelled=None):
+    """List audio files under folder in a deterministic order, stopping early if cancelled()"""
+    paths = []
+    for root, dirs, files in os.walk(folder):
+        if cancelled is not None and cancelled():
+            break
+        dirs.sort()
+        for f in sorted(files):
+            if f.lower().endswith(AUDIO_EXTENSIONS):
+                paths.append(os.path.join(root, f))
+    return paths
+
+
+# Fewer files than this are parsed serially: each spawned worker re-imports
+# PyQt5, vlc and mutagen, which costs more than parsing a few files
+POOL_MIN_FILES = 256
+
+
+def iter_music_batches(folder, index=None, workers=1, batch_size=200, cancelled=None):
+    """Scan music folder, yielding (songs, done, total) batches as they are read"""
     if not os.path.exists(folder):
         os.makedirs(folder)
-        return songs
-    
-    for root, _, files in os.walk(folder):
-        for f in files:
-            if f.lower().endswith((".mp3", ".wav", ".flac", ".ogg", ".m4a", ".aac")):
-                path = os.path.join(root, f)
-                try:
-                    meta = File(path, easy=True)
-                    album_art = None
-
-                    if f.lower().endswith(".mp3"):
-                        try:
-                            tags = ID3(path)
-                            for tag in tags.values():
-                                if isinstance(tag, APIC):
-                                    album_art = QImage.fromData(tag.data)
-                                    break
-                        except:
-                            pass
-
-                    songs.append({
-                        "title": meta.get("title", [os.path.splitext(f)[0]])[0] if meta else os.path.splitext(f)[0],
-                        "artist": meta.get("artist", ["Unknown Artist"])[0] if meta else "Unknown Artist",
-                        "album": meta.get("album", ["Unknown Album"])[0] if meta else "Unknown Album",
-                        "genre": meta.get("genre", ["Unknown Genre"])[0] if meta else "Unknown Genre",
-                        "file": path,
-                        "art": album_art,
-                        "duration": 0,
-                        "plays": 0
-                    })
-                except Exception as e:
-                    print(f"Error reading {path}: {e}")
+        return
+
+    cancelled = cancelled or (lambda: False)
+    started = time.perf_counter()
+    stats = {"files": 0, "stat_calls": 0, "parsed": 0, "reused": 0, "errors": 0,
+             "workers": workers}
+    paths = list_music_files(folder, cancelled)
+    if cancelled():
+        return
+    stats["files"] = len(paths)
+
+    # Look up unchanged files in the index, collecting the rest for parsing
+    entries = [None] * len(paths)
+    file_stats = {}
+    pending = []
+    for i, path in enumerate(paths):
+        if cancelled():
+            return
+        if index is not None:
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                stats["errors"] += 1
+                print(f"Error reading {path}: {e}")
+                continue
+            stats["stat_calls"] += 1
+            file_stats[path] = st
+            entries[i] = index.lookup(path, st)
+        if entries[i] is None:
+            pending.append(i)
+
+    # Parse new or changed files lazily, serially or across a process pool
+    pending_paths = [paths[i] for i in pending]
+    pool = None
+    if workers > 1 and len(pending_paths) >= max(POOL_MIN_FILES, workers * 8):
+        chunksize = max(1, min(64, len(pending_paths) // (workers * 4)))
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        results = pool.map(_parse_song_file, pending_paths, chunksize=chunksize)
+    else:
+        results = map(_parse_song_file, pending_paths)
+
+    pending_set = set(pending)
+    batch = []
+    finished = False
+    try:
+        for i, path in enumerate(paths):
+            if cancelled():
+                break
+            entry = entries[i]
+            if i in pending_set:
+                meta, error = next(results)
+                if error is not None:
+                    stats["errors"] += 1
+                    print(f"Error reading {path}: {error}")
+                    continue
+                stats["parsed"] += 1
+                entry = index.store(path, file_stats[path], meta) if index is not None else meta
+            elif entry is None:
+                continue
+            else:
+                stats["reused"] += 1
+
+            batch.append(Track(path, entry))
+            if len(batch) >= batch_size:
+                yield batch, i + 1, len(paths)
+                batch = []
+        else:
+            finished = True
+        if batch:
+            yield batch, len(paths) if finished else i, len(paths)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=finished, cancel_futures=True)
+
+    if index is not None:
+        stats["pruned"] = index.prune(file_stats) if finished else 0
+        stats["cancelled"] = not finished
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        stats["finished"] = datetime.now().isoformat(timespec="seconds")
+        index.stats = stats
+        try:
+            index.save()
+        except OSError as e:
+            print(f"Error saving library index: {e}")
+
+
+def scan_music_folder(folder, index=None, workers=1):
+    """Scan music folder and extract metadata"""
+    songs = []
+    for batch, _, _ in iter_music_batches(folder, index, workers):
+        songs.extend(batch)
     return songs
 
 
+class LibraryScanner(QThread):
+    """Background thread that scans the music folder and streams songs in batches"""
+    batch_ready = pyqtSignal(list)
+    progress = pyqtSignal(int, int)
+    scan_finished = pyqtSignal(bool)
+    EMIT_INTERVAL = 0.1  # Seconds between batches handed to the GUI thread
+
+    def __init__(self, folder, index, workers, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.index = index
+        self.workers = workers
+        self._cancelled = False
+
+    def cancel(self):
+        """Ask the scan to stop after the current file"""
+        self._cancelled = True
+
+    def run(self):
+        # Batches are merged so the GUI thread is not handed them faster than it can add them
+        pending = []
+        emitted = 0
+        done = total = 0
+        for batch, done, total in iter_music_batches(self.folder, self.index, self.workers,
+                                                      cancelled=lambda: self._cancelled):
+            pending.extend(batch)
+            if time.monotonic() - emitted >= self.EMIT_INTERVAL:
+                self.batch_ready.emit(pending)
+                self.progress.emit(done, total)
+                pending = []
+                emitted = time.monotonic()
+        if pending:
+            self.batch_ready.emit(pending)
+            self.progress.emit(done, total)
+        self.scan_finished.emit(not self._cancelled)
+
+
+class VlcEventBridge(QObject):
+    """Hands libvlc player events to the GUI thread"""
+    pending = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.events = queue.Queue()
+        self.handlers = {}
+        self.latencies = deque(maxlen=200)  # Seconds from callback to handler
+        self.muted = set()
+        self._signalled = False
+        self.pending.connect(self.dispatch, Qt.QueuedConnection)
+
+    def connect_event(self, players, event_type, handler):
+        """Call handler(player, value) on the GUI thread for event_type on each of players"""
+        self.handlers[event_type] = handler
+        for player in players:
+            player.event_manager().event_attach(event_type, self._queue_event, player)
+
+    def set_muted(self, event_type, muted):
+        """Drop event_type as it arrives, without waking the GUI thread, while muted"""
+        if muted:
+            self.muted.add(event_type)
+        else:
+            self.muted.discard(event_type)
+
+    def _queue_event(self, event, player):
+        # Runs on a libvlc thread; the event is only valid during this call
+        if event.type in self.muted:
+            return
+        if event.type == vlc.EventType.MediaPlayerTimeChanged:
+            value = event.u.new_time
+        elif event.type == vlc.EventType.MediaPlayerLengthChanged:
+            value = event.u.new_length
+        elif event.type == vlc.EventType.MediaPlayerBuffering:
+            value = event.u.new_cache
+        else:
+            value = None
+        self.events.put((event.type, player, value, time.perf_counter()))
+        if not self._signalled:
+            self._signalled = True
+            self.pending.emit()
+
+    def dispatch(self):
+        """Handle every queued event, in order"""
+        self._signalled = False
+        batch = []
+        while True:
+            try:
+                batch.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        latest_time = {}
+        for i, (event_type, player, _, _) in enumerate(batch):
+            if event_type == vlc.EventType.MediaPlayerTimeChanged:
+                latest_time[player] = i
+        for i, (event_type, player, value, queued) in enumerate(batch):
+            if event_type == vlc.EventType.MediaPlayerTimeChanged and latest_time[player] != i:
+                continue
+            self.latencies.append(time.perf_counter() - queued)
+            self.handlers[event_type](player, value)
+
+
+class FolderWalker(QThread):
+    """Background thread that lists the music folder's subfolders and spots ones whose files changed"""
+    walked = pyqtSignal(list, list, dict)  # Folders, changed folders, folder mtimes
+
+    def __init__(self, folder, index, check_files, dir_mtimes=None, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.index = index
+        self.check_files = check_files  # Compare audio files against the library index
+        self.dir_mtimes = dir_mtimes  # From the previous walk; a folder whose mtime moved has changed
+        self._cancelled = False
+
+    def cancel(self):
+        """Ask the walk to stop after the current folder"""
+        self._cancelled = True
+
+    def run(self):
+        folders = []
+        changed = []
+        mtimes = {}
+        for root, _, files in os.walk(self.folder):
+            if self._cancelled:
+                return
+            try:
+                mtimes[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+            folders.append(root)
+            if self.dir_mtimes is not None and self.dir_mtimes.get(root) != mtimes[root]:
+                changed.append(root)
+                continue
+            if not self.check_files:
+                continue
+            for f in files:
+                if not f.lower().endswith(AUDIO_EXTENSIONS):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, f))
+                except OSError:
+                    continue
+                if self.index.lookup(os.path.join(root, f), st) is None:
+                    # Tags edited in place: the folder itself is untouched
+                    changed.append(root)
+                    break
+        self.walked.emit(folders, changed, mtimes)
+
+
+class MetadataReader(QThread):
+    """Background thread that reads the tags of a few new or changed files"""
+    files_read = pyqtSignal(list)
+
+    def __init__(self, files, parent=None):
+        super().__init__(parent)
+        self.files = files  # [(path, stat)]
+
+    def run(self):
+        self.files_read.emit([(path, st) + _parse_song_file(path) for path, st in self.files])
+
+
+class SongGridModel(QAbstractListModel):
+    """List model over the songs shown in the library grid"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.songs = []
+        self._rows = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        song = self.songs[index.row()]
+        if role == Qt.UserRole:
+            return song
+        if role == Qt.DisplayRole:
+            return song.title
+        if role == Qt.ToolTipRole:
+            return f"{song.title}\n{song.artist} • {song.album}"
+        return None
+
+    def set_songs(self, songs):
+        """Show a new list of songs"""
+        self.beginResetModel()
+        self.songs = songs
+        self._rows = len(songs)
+        self.endResetModel()
+
+    def rows_appended(self):
+        """Expose songs appended to the shown list since the last update"""
+        if len(self.songs) > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, len(self.songs) - 1)
+            self._rows = len(self.songs)
+            self.endInsertRows()
+
+
+class SongTileDelegate(QStyledItemDelegate):
+    """Paints library tiles: album art, title, artist and play count"""
+
+    ART_HEIGHT = 150
+
+    def __init__(self, player):
+        super().__init__(player)
+        self.player = player
+        self.title_font = QFont("Arial", 9, QFont.Bold)
+        self.artist_font = QFont()
+        self.artist_font.setPointSize(8)
+        self.plays_font = QFont()
+        self.plays_font.setPointSize(7)
+
+    def sizeHint(self, option, index):
+        return QSize(self.player.TILE_WIDTH, self.player.TILE_HEIGHT)
+
+    def paint(self, painter, option, index):
+        song = index.data(Qt.UserRole)
+        if song is None:
+            return
+        tile = QRect(option.rect.topLeft(), self.sizeHint(option, index))
+        tile.moveCenter(option.rect.center())
+        hovered = option.state & QStyle.State_MouseOver
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#2d2d2d" if hovered else "#1a1a1a"))
+        painter.drawRoundedRect(tile, 10, 10)
+
+        # Album art
+        art_rect = QRect(tile.left() + 8, tile.top() + 8, tile.width() - 16, self.ART_HEIGHT)
+        art = self.player.album_art_thumbnail(song, art_rect.width(), art_rect.height(), wait=False)
+        if art:
+            target = QRect(QPoint(0, 0), art.size())
+            target.moveCenter(art_rect.center())
+            painter.drawImage(target, art)
+        else:
+            painter.setBrush(QColor("#3d3d3d"))
+            painter.drawRoundedRect(art_rect, 8, 8)
+
+        # Title
+        text_rect = QRect(tile.left() + 8, art_rect.bottom() + 6, tile.width() - 16, 36)
+        title_text = song.title[:35] + "..." if len(song.title) > 35 else song.title
+        painter.setPen(QColor("#ffffff"))
+        painter.setFont(self.title_font)
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap, title_text)
+
+        # Artist
+        text_rect.translate(0, 38)
+        text_rect.setHeight(16)
+        artist_text = song.artist[:30] + "..." if len(song.artist) > 30 else song.artist
+        painter.setPen(QColor("#b3b3b3"))
+        painter.setFont(self.artist_font)
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop, artist_text)
+
+        # Play count
+        if song.plays > 0:
+            text_rect.translate(0, 18)
+            painter.setPen(QColor("#1db954"))
+            painter.setFont(self.plays_font)
+            painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop, f"▶ {song.plays} plays")
+
+        painter.restore()
+
+
+class SongGridView(QListView):
+    """Library grid that re-flows tiles on resize"""
+
+    def __init__(self, tile_size, tile_spacing, parent=None):
+        super().__init__(parent)
+        self.tile_size = tile_size
+        self.tile_spacing = tile_spacing
+        self.columns = 0
+        self.anchor = None  # Row to bring back to the top once the new layout reaches it
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Fixed)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(2000)
+        self.setGridSize(self.cell_size(1))
+
+    def available_width(self):
+        """Viewport width, always leaving room for the scroll bar so it appearing cannot wrap a column"""
+        return self.width() - 2 * self.frameWidth() - self.verticalScrollBar().sizeHint().width() - 1
+
+    def column_count(self):
+        """Number of columns of tile_size plus tile_spacing that fit the available width"""
+        return max(1, (self.available_width() - self.tile_spacing // 2) // (self.tile_size.width() + self.tile_spacing))
+
+    def cell_size(self, columns):
+        """Spread columns evenly across the available width"""
+        # Tiles are centred in their cells, and the view's contents reach past the
+        # last cell by that centring margin, so it is left room too
+        tile = self.tile_size.width()
+        width = max(tile + self.tile_spacing, (2 * self.available_width() + tile) // (2 * columns + 1))
+        return QSize(width, self.tile_size.height() + self.tile_spacing)
+
+    def screenful(self):
+        """Number of tiles that fit in the view, plus a row for partly shown ones"""
+        cell = self.gridSize()
+        columns = max(1, self.available_width() // cell.width())
+        return columns * (self.viewport().height() // cell.height() + 2)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        columns = self.column_count()
+        # Cells are only re-spread when the columns change, or when shrinking left them too wide
+        if columns == self.columns and self.gridSize().width() <= self.cell_size(columns).width():
+            return
+        self.columns = columns
+        cell = self.gridSize()
+        anchor = self.indexAt(QPoint(cell.width() // 2, cell.height() // 2))
+        self.anchor = QPersistentModelIndex(anchor) if anchor.isValid() else None
+        self.setGridSize(self.cell_size(columns))  # Lays the items out again, in batches
+
+    def updateGeometries(self):
+        super().updateGeometries()
+        if self.anchor is None:
+            return
+        if not self.anchor.isValid():
+            self.anchor = None
+        elif self.rectForIndex(QModelIndex(self.anchor)).isValid():
+            anchor, self.anchor = QModelIndex(self.anchor), None
+            self.scrollTo(anchor, QListView.PositionAtTop)
+
+
 class ClickableSlider(QSlider):
     """Custom slider that allows clicking to seek"""
     def mousePressEvent(self, event):
@@ -92,8 +1229,26 @@ class ClickableSlider(QSlider):
 
 
 class MusicPlayer(QWidget):
+    thumbnail_ready = pyqtSignal(tuple, object)
     TILE_WIDTH = 180
     TILE_HEIGHT = 260
+    FS_QUIET_MS = 750  # Wait for this much quiet before applying folder changes
+    FS_MAX_DELAY = 5  # ...but never hold a burst back longer than this (seconds)
+    FS_RESCAN_THRESHOLD = 500  # Bigger bursts fall back to a background rescan
+    FS_CHECK_INTERVAL_MS = 30000  # How often files are checked for in-place edits
+    FS_WATCH_CHUNK = 256  # Folders added to the watcher per event loop turn
+    INDEX_SAVE_DELAY_MS = 60000  # Folder changes are written to the library index at most this often
+    SEARCH_DELAY_MS = 150  # Typing pause before a search runs
+    GRID_SLICE = 0.004  # Seconds of grid building per event loop turn
+    GRID_CHUNK = 1000  # Tracks checked between deadline checks
+    # Track attribute ordering each sort_combo entry after Default; Most Played is descending
+    SORT_KEYS = (None, "title_key", "artist_key", "album_key", "plays")
+    # Playback modes, cycled by the mode button; gapless and crossfade preload the next track
+    PLAYBACK_MODES = {"standard": "▶ Standard", "gapless": "⏩ Gapless", "crossfade": "🔀 Crossfade"}
+    HANDOFF_LEAD = 0.1  # Starting guess (seconds) for how long a preloaded track takes to start
+    FADE_STEP_MS = 20  # Volume ramp resolution during a crossfade
+    HANDOFF_PREPARE = 2  # Seconds before a handoff to check the preloaded song is still next
+    PROGRESS_MIN_MS = 16  # Shortest wait between progress repaints
 
     def __init__(self):
         super().__init__()
@@ -102,35 +1257,147 @@ class MusicPlayer(QWidget):
 
         self.vlc_instance = vlc.Instance()
         self.player = self.vlc_instance.media_player_new()
+        # Gapless playback opens the next track on a second player and swaps
+        # the two when the current track runs out
+        self.standby_player = self.vlc_instance.media_player_new()
+        self.preloaded = None
+        self.player_media = self.standby_media = None  # What each player was last given
+        self.handoff_lead = self.HANDOFF_LEAD
+        # Track change latency: from the previous track ending (or the user
+        # asking for another one) until the new one is playing
+        self.change_pending = False
+        self.change_mark = None
+        self.change_started = None
+        self.handoff_started = None
+        self.change_latencies = deque(maxlen=20)
+        # Player events arrive on libvlc threads and are handled on the GUI thread
+        players = (self.player, self.standby_player)
+        self.vlc_events = VlcEventBridge(self)
+        self.vlc_events.connect_event(players, vlc.EventType.MediaPlayerEndReached, self.on_song_end)
+        self.vlc_events.connect_event(players, vlc.EventType.MediaPlayerPlaying, self.on_playback_started)
+        self.vlc_events.connect_event(players, vlc.EventType.MediaPlayerTimeChanged, self.on_time_changed)
+        self.vlc_events.connect_event(players, vlc.EventType.MediaPlayerLengthChanged, self.on_length_changed)
+        self.vlc_events.connect_event(players, vlc.EventType.MediaPlayerBuffering, self.on_buffering)
+        self.vlc_events.connect_event(players, vlc.EventType.MediaPlayerEncounteredError, self.on_playback_error)
 
-        self.songs = scan_music_folder(MUSIC_DIR)
-        self.filtered_songs = self.songs.copy()
+        self.settings = self.load_settings()
+        self.scan_workers = self.settings.get("scan_workers", os.cpu_count() or 1)
+        self.watch_library = self.settings.get("watch_library", True)
+        self.art_cache = AlbumArtCache(self.settings.get("art_cache_mb", 64) * 1024 * 1024)
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnail_pool = QThreadPool(self)
+        self.thumbnail_pool.setMaxThreadCount(2)
+        self.thumbnails_pending = set()  # Art cache keys with a ThumbnailJob queued
+        self.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.media_cache = MediaCache(self.vlc_instance, self.settings.get("media_cache_items", 64))
+        self.library_index = LibraryIndex()
+        self.scanner = None
+        self.scan_current = None  # Path of the playing song, until a rescan finds it again
+        self.reset_library()
+        self.filtered_songs = []
         self.current_index = -1
         self.is_shuffle = False
         self.repeat_mode = 0  # 0: no repeat, 1: repeat all, 2: repeat one
         self.shuffle_history = []
+        self.shuffle_next = None
         self.play_queue = []
+        self.queue_duration = 0
+        self.position_ms = 0
+        self.position_at = 0  # perf_counter() when position_ms was reported
+        self.length_ms = 0
+        self.buffering = 100
+
+        # Search runs after a typing pause, narrowing the last result set when
+        # the query only got longer
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_query = None
+        self.search_results = None
+        self.search_bits = None
+        # Browse selections: OR within a field, AND across fields and with the search
+        self.facet_selection = {field: set() for field in FACET_FIELDS}
+        self.browse_dirty = False
+        # Filtered grid contents are collected in time slices; a newer
+        # filter bumps the generation to cancel a stale build
+        self.grid_generation = 0
+        self.grid_build_ids = None
         
         self.playlists = self.load_playlists()
         self.current_playlist = None
-        self.settings = self.load_settings()
         self.favorites = self.settings.get("favorites", [])
+        self.saved_searches = self.settings.get("saved_searches", {})
         self.recent_plays = self.settings.get("recent_plays", [])
+        self.playback_mode = self.settings.get("playback_mode", "standard")
+        if self.playback_mode not in self.PLAYBACK_MODES:
+            self.playback_mode = "standard"
+        self.crossfade_seconds = self.settings.get("crossfade_seconds", 6)
 
         self.init_ui()
         self.apply_theme()
 
+        # Progress is driven by VLC's time and length events; while the song
+        # plays on screen, this timer repaints at the next visible change
         self.timer = QTimer(self)
-        self.timer.setInterval(500)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.update_progress)
+
+        # Starts the preloaded track just before the current one ends, early
+        # enough to cover the time it takes to start
+        self.handoff_timer = QTimer(self)
+        self.handoff_timer.setSingleShot(True)
+        self.handoff_timer.setTimerType(Qt.PreciseTimer)
+        self.handoff_timer.timeout.connect(self.hand_off)
+
+        # Crossfades ramp both players' volumes on their own precise timer
+        self.fade_timer = QTimer(self)
+        self.fade_timer.setTimerType(Qt.PreciseTimer)
+        self.fade_timer.setInterval(self.FADE_STEP_MS)
+        self.fade_timer.timeout.connect(self.step_fade)
+        self.fade_started = 0
+        self.fade_length = 0
         
         # Auto-save timer
         self.save_timer = QTimer(self)
         self.save_timer.setInterval(30000)  # Save every 30 seconds
         self.save_timer.timeout.connect(self.save_settings)
         self.save_timer.start()
-        
-        self.player.event_manager().event_attach(vlc.EventType.MediaPlayerEndReached, self.on_song_end)
+
+        # Browse lists are rebuilt at most once a second while a scan streams in
+        self.browse_refresh_timer = QTimer(self)
+        self.browse_refresh_timer.setSingleShot(True)
+        self.browse_refresh_timer.setInterval(1000)
+        self.browse_refresh_timer.timeout.connect(self.populate_browse_lists)
+
+        # Folder watching: directory events are collected and applied in one batch
+        # once the folder has been quiet for a moment. Editing tags in place does
+        # not touch the directory, so a periodic walk catches those, along with
+        # changes in folders the watcher could not take.
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_library_dir_changed)
+        self.folder_walker = None
+        self.fs_dir_mtimes = None  # Folder mtimes seen by the last walk
+        self.fs_watch_queue = []  # Folders waiting to be added to the watcher
+        self.fs_unwatched = set()  # Folders the watcher refused, e.g. past the inotify limit
+        self.fs_check_timer = QTimer(self)
+        self.fs_check_timer.setInterval(self.FS_CHECK_INTERVAL_MS)
+        self.fs_check_timer.timeout.connect(self.check_library_folders)
+        self.fs_pending_dirs = set()
+        self.fs_burst_started = 0
+        self.fs_flush_timer = QTimer(self)
+        self.fs_flush_timer.setSingleShot(True)
+        self.fs_flush_timer.setInterval(self.FS_QUIET_MS)
+        self.fs_flush_timer.timeout.connect(self.apply_library_fs_changes)
+        self.fs_reader = None
+        self.fs_burst = None  # (new_songs, removed, changed) waiting on fs_reader
+        self.index_save_timer = QTimer(self)
+        self.index_save_timer.setSingleShot(True)
+        self.index_save_timer.setInterval(self.INDEX_SAVE_DELAY_MS)
+        self.index_save_timer.timeout.connect(self.save_library_index)
+
+        self.start_library_scan()
 
     def init_ui(self):
         main_layout = QVBoxLayout()
@@ -147,11 +1414,29 @@ class MusicPlayer(QWidget):
         title_label.setStyleSheet("color: #1db954;")
         top_bar.addWidget(title_label)
         top_bar.addStretch()
+
+        self.scan_progress = QProgressBar()
+        self.scan_progress.setMaximumWidth(220)
+        self.scan_progress.setFormat("Scanning %v / %m")
+        self.scan_progress.hide()
+        top_bar.addWidget(self.scan_progress)
+
+        self.cancel_scan_button = QPushButton("✖ Cancel Scan")
+        self.cancel_scan_button.clicked.connect(self.cancel_library_scan)
+        self.cancel_scan_button.hide()
+        top_bar.addWidget(self.cancel_scan_button)
         
         self.folder_button = QPushButton("📁 Change Folder")
         self.folder_button.clicked.connect(self.change_music_folder)
         top_bar.addWidget(self.folder_button)
         
+        self.watch_button = QPushButton("👁 Watch")
+        self.watch_button.setCheckable(True)
+        self.watch_button.setChecked(self.watch_library)
+        self.watch_button.setToolTip("Pick up added, removed and changed files automatically")
+        self.watch_button.clicked.connect(self.toggle_watch_library)
+        top_bar.addWidget(self.watch_button)
+        
         self.refresh_button = QPushButton("🔄 Refresh")
         self.refresh_button.clicked.connect(self.refresh_library)
         top_bar.addWidget(self.refresh_button)
@@ -167,8 +1452,8 @@ class MusicPlayer(QWidget):
 
         search_layout = QHBoxLayout()
         self.search_bar = QLineEdit()
-        self.search_bar.setPlaceholderText("🔍 Search by artist, album, genre, title...")
-        self.search_bar.textChanged.connect(self.apply_filter)
+        self.search_bar.setPlaceholderText('🔍 Search... e.g. artist:kaytranada genre:house plays:>5 -title:remix "exact phrase"')
+        self.search_bar.textChanged.connect(self.schedule_search)
         search_layout.addWidget(self.search_bar)
         
         self.sort_combo = QComboBox()
@@ -176,21 +1461,34 @@ class MusicPlayer(QWidget):
         self.sort_combo.currentIndexChanged.connect(self.apply_sort)
         search_layout.addWidget(self.sort_combo)
         
+        save_search_btn = QPushButton("💾 Save")
+        save_search_btn.setToolTip("Save this search to the Browse tab")
+        save_search_btn.clicked.connect(self.save_search)
+        search_layout.addWidget(save_search_btn)
+
         clear_btn = QPushButton("✖ Clear")
         clear_btn.clicked.connect(self.clear_search)
         search_layout.addWidget(clear_btn)
         
         lib_layout.addLayout(search_layout)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.grid_widget = QWidget()
-        self.grid_layout = QGridLayout()
-        self.grid_layout.setSpacing(20)
-        self.grid_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.grid_widget.setLayout(self.grid_layout)
-        self.scroll_area.setWidget(self.grid_widget)
-        lib_layout.addWidget(self.scroll_area)
+        self.no_songs_label = QLabel("No songs found. Add music to your library!")
+        self.no_songs_label.setAlignment(Qt.AlignCenter)
+        self.no_songs_label.setStyleSheet("color: #b3b3b3; font-size: 14px;")
+        lib_layout.addWidget(self.no_songs_label)
+
+        # Tiles are painted by a delegate, so only the visible ones cost anything
+        self.song_model = SongGridModel(self)
+        self.song_view = SongGridView(QSize(self.TILE_WIDTH, self.TILE_HEIGHT), 10)
+        self.song_view.setSelectionMode(QListView.NoSelection)
+        self.song_view.setMouseTracking(True)
+        self.song_view.setCursor(Qt.PointingHandCursor)
+        self.song_view.setModel(self.song_model)
+        self.song_view.setItemDelegate(SongTileDelegate(self))
+        self.song_view.doubleClicked.connect(lambda index: self.play_song(self.grid_position(index.row())))
+        self.song_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.song_view.customContextMenuRequested.connect(self.on_grid_context_menu)
+        lib_layout.addWidget(self.song_view)
 
         self.library_tab.setLayout(lib_layout)
         self.tabs.addTab(self.library_tab, "🎵 Library")
@@ -212,7 +1510,8 @@ class MusicPlayer(QWidget):
         artist_header.setFont(QFont("Arial", 10, QFont.Bold))
         artist_layout.addWidget(artist_header)
         self.artist_list = QListWidget()
-        self.artist_list.itemClicked.connect(lambda: self.filter_by("artist"))
+        self.artist_list.setSelectionMode(QListWidget.MultiSelection)
+        self.artist_list.itemSelectionChanged.connect(lambda: self.filter_by("artist"))
         artist_layout.addWidget(self.artist_list)
         artist_widget.setLayout(artist_layout)
         
@@ -223,7 +1522,8 @@ class MusicPlayer(QWidget):
         album_header.setFont(QFont("Arial", 10, QFont.Bold))
         album_layout.addWidget(album_header)
         self.album_list = QListWidget()
-        self.album_list.itemClicked.connect(lambda: self.filter_by("album"))
+        self.album_list.setSelectionMode(QListWidget.MultiSelection)
+        self.album_list.itemSelectionChanged.connect(lambda: self.filter_by("album"))
         album_layout.addWidget(self.album_list)
         album_widget.setLayout(album_layout)
         
@@ -234,18 +1534,47 @@ class MusicPlayer(QWidget):
         genre_header.setFont(QFont("Arial", 10, QFont.Bold))
         genre_layout.addWidget(genre_header)
         self.genre_list = QListWidget()
-        self.genre_list.itemClicked.connect(lambda: self.filter_by("genre"))
+        self.genre_list.setSelectionMode(QListWidget.MultiSelection)
+        self.genre_list.itemSelectionChanged.connect(lambda: self.filter_by("genre"))
         genre_layout.addWidget(self.genre_list)
         genre_widget.setLayout(genre_layout)
 
+        # Saved searches
+        saved_widget = QWidget()
+        saved_layout = QVBoxLayout()
+        saved_header = QLabel("🔖 Saved Searches")
+        saved_header.setFont(QFont("Arial", 10, QFont.Bold))
+        saved_layout.addWidget(saved_header)
+        self.saved_search_list = QListWidget()
+        self.saved_search_list.itemClicked.connect(self.apply_saved_search)
+        self.saved_search_list.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.saved_search_list.customContextMenuRequested.connect(self.show_saved_search_context_menu)
+        saved_layout.addWidget(self.saved_search_list)
+        saved_widget.setLayout(saved_layout)
+
         browse_splitter.addWidget(artist_widget)
         browse_splitter.addWidget(album_widget)
         browse_splitter.addWidget(genre_widget)
+        browse_splitter.addWidget(saved_widget)
         browse_layout.addWidget(browse_splitter)
+        self.browse_lists = {"artist": self.artist_list, "album": self.album_list, "genre": self.genre_list}
+
+        selection_bar = QHBoxLayout()
+        self.facet_summary = QLabel()
+        self.facet_summary.setStyleSheet("color: #b3b3b3;")
+        selection_bar.addWidget(self.facet_summary, 1)
+        clear_facets_btn = QPushButton("✖ Clear Selection")
+        clear_facets_btn.clicked.connect(self.clear_facets)
+        selection_bar.addWidget(clear_facets_btn)
+        show_songs_btn = QPushButton("🎵 Show Songs")
+        show_songs_btn.clicked.connect(lambda: self.tabs.setCurrentWidget(self.library_tab))
+        selection_bar.addWidget(show_songs_btn)
+        browse_layout.addLayout(selection_bar)
 
         self.populate_browse_lists()
         self.browse_tab.setLayout(browse_layout)
         self.tabs.addTab(self.browse_tab, "📂 Browse")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
         # --- PLAYLISTS TAB ---
         self.playlists_tab = QWidget()
@@ -329,7 +1658,13 @@ class MusicPlayer(QWidget):
         # --- QUEUE TAB ---
         self.queue_tab = QWidget()
         queue_layout = QVBoxLayout()
-        queue_layout.addWidget(QLabel("📜 Play Queue"))
+        queue_header = QHBoxLayout()
+        queue_header.addWidget(QLabel("📜 Play Queue"))
+        queue_header.addStretch()
+        self.queue_summary = QLabel("")
+        self.queue_summary.setStyleSheet("color: #b3b3b3;")
+        queue_header.addWidget(self.queue_summary)
+        queue_layout.addLayout(queue_header)
         self.queue_list = QListWidget()
         self.queue_list.itemDoubleClicked.connect(self.play_from_queue)
         queue_layout.addWidget(self.queue_list)
@@ -437,6 +1772,20 @@ class MusicPlayer(QWidget):
         self.repeat_button.setToolTip("Repeat")
         self.repeat_button.setFixedSize(45, 45)
         controls.addWidget(self.repeat_button)
+
+        self.mode_button = QPushButton(self.PLAYBACK_MODES[self.playback_mode])
+        self.mode_button.clicked.connect(self.cycle_playback_mode)
+        self.mode_button.setFixedHeight(45)
+        controls.addWidget(self.mode_button)
+        self.crossfade_spin = QSpinBox()
+        self.crossfade_spin.setRange(1, 12)
+        self.crossfade_spin.setSuffix(" s")
+        self.crossfade_spin.setValue(self.crossfade_seconds)
+        self.crossfade_spin.setToolTip("Crossfade length")
+        self.crossfade_spin.valueChanged.connect(self.change_crossfade)
+        self.crossfade_spin.setVisible(self.playback_mode == "crossfade")
+        controls.addWidget(self.crossfade_spin)
+        self.update_mode_tooltip()
         
         controls.addStretch()
         
@@ -585,99 +1934,71 @@ class MusicPlayer(QWidget):
                 border-radius: 10px;
                 padding: 5px;
             }
-            QScrollArea {
+            QListView {
+                background-color: #181818;
                 border: none;
             }
             QLabel {
                 color: #ffffff;
             }
+            QProgressBar {
+                background-color: #2d2d2d;
+                border: 1px solid #3d3d3d;
+                border-radius: 6px;
+                color: #ffffff;
+                text-align: center;
+            }
+            QProgressBar::chunk {
+                background-color: #1db954;
+                border-radius: 6px;
+            }
         """)
 
     def populate_song_grid(self):
-        """Populate the grid with song tiles"""
-        for i in reversed(range(self.grid_layout.count())):
-            widget = self.grid_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-
-        if not self.filtered_songs:
-            no_songs = QLabel("No songs found. Add music to your library!")
-            no_songs.setAlignment(Qt.AlignCenter)
-            no_songs.setStyleSheet("color: #b3b3b3; font-size: 14px;")
-            self.grid_layout.addWidget(no_songs, 0, 0)
+        """Show filtered_songs in the library grid"""
+        self.song_model.set_songs(self.filtered_songs)
+        self.no_songs_label.setVisible(not self.filtered_songs)
+
+    def add_song_tiles(self):
+        """Show songs appended to filtered_songs since the grid was populated"""
+        if self.song_model.songs is not self.filtered_songs:
+            self.populate_song_grid()
             return
-
-        columns = max(1, (self.scroll_area.width() - 60) // (self.TILE_WIDTH + 20))
-        row = 0
-        col = 0
-
-        for idx, song in enumerate(self.filtered_songs):
-            frame = QFrame()
-            frame.setFrameShape(QFrame.StyledPanel)
-            frame.setFixedSize(self.TILE_WIDTH, self.TILE_HEIGHT)
-            frame.setCursor(Qt.PointingHandCursor)
-            frame.setStyleSheet("""
-                QFrame {
-                    background-color: #1a1a1a;
-                    border-radius: 10px;
-                    padding: 8px;
-                }
-                QFrame:hover {
-                    background-color: #2d2d2d;
-                }
-            """)
-            
-            v_layout = QVBoxLayout()
-            v_layout.setContentsMargins(8, 8, 8, 8)
-            v_layout.setSpacing(5)
-
-            # Album art
-            if song["art"]:
-                pixmap = QPixmap.fromImage(song["art"])
-            else:
-                pixmap = QPixmap(self.TILE_WIDTH - 16, 150)
-                pixmap.fill(QColor("#3d3d3d"))
-            
-            label_art = QLabel()
-            label_art.setPixmap(pixmap.scaled(self.TILE_WIDTH - 16, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-            label_art.setAlignment(Qt.AlignCenter)
-            label_art.setStyleSheet("border-radius: 8px;")
-            v_layout.addWidget(label_art)
-
-            # Title
-            title_text = song["title"][:35] + "..." if len(song["title"]) > 35 else song["title"]
-            label_title = QLabel(title_text)
-            label_title.setAlignment(Qt.AlignCenter)
-            label_title.setWordWrap(True)
-            label_title.setFont(QFont("Arial", 9, QFont.Bold))
-            label_title.setStyleSheet("color: #ffffff;")
-            v_layout.addWidget(label_title)
-
-            # Artist
-            artist_text = song["artist"][:30] + "..." if len(song["artist"]) > 30 else song["artist"]
-            label_artist = QLabel(artist_text)
-            label_artist.setAlignment(Qt.AlignCenter)
-            label_artist.setStyleSheet("color: #b3b3b3; font-size: 8pt;")
-            v_layout.addWidget(label_artist)
-
-            # Play count
-            if song.get("plays", 0) > 0:
-                plays_label = QLabel(f"▶ {song['plays']} plays")
-                plays_label.setAlignment(Qt.AlignCenter)
-                plays_label.setStyleSheet("color: #1db954; font-size: 7pt;")
-                v_layout.addWidget(plays_label)
-
-            v_layout.addStretch()
-            frame.setLayout(v_layout)
-            frame.mouseDoubleClickEvent = lambda e, index=idx: self.play_song(index)
-            frame.setContextMenuPolicy(Qt.CustomContextMenu)
-            frame.customContextMenuRequested.connect(lambda pos, index=idx: self.show_song_context_menu(index))
-
-            self.grid_layout.addWidget(frame, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+        self.song_model.rows_appended()
+        self.no_songs_label.setVisible(not self.filtered_songs)
+
+    def grid_position(self, row):
+        """Map a grid row to a position in filtered_songs"""
+        # Playing a playlist or favorites swaps filtered_songs but not the grid
+        if self.song_model.songs is not self.filtered_songs:
+            self.filtered_songs = self.song_model.songs
+            self.shuffle_history.clear()
+        return row
+
+    def on_grid_context_menu(self, pos):
+        """Show the song context menu for the tile under pos"""
+        index = self.song_view.indexAt(pos)
+        if index.isValid():
+            self.show_song_context_menu(self.grid_position(index.row()))
+
+    def album_art_thumbnail(self, song, width, height, wait=True):
+        """Get a song's album art scaled to fit width x height, or None; without wait, a missing one is made in the background"""
+        if not song.art_hash:
+            return None
+        key = (song.art_hash, width, height)
+        if wait:
+            return self.art_cache.get(key, lambda: self.thumbnail_cache.load(song, width, height))
+        found, image = self.art_cache.lookup(key)
+        if not found and key not in self.thumbnails_pending:
+            self.thumbnails_pending.add(key)
+            self.thumbnail_pool.start(ThumbnailJob(self.thumbnail_cache, song, width, height, self.thumbnail_ready))
+        return image
+
+    def on_thumbnail_ready(self, key, image):
+        """Cache a thumbnail made in the background and repaint the tiles showing it"""
+        self.thumbnails_pending.discard(key)
+        self.art_cache.store(key, image)
+        self.song_view.viewport().update()
 
     def show_song_context_menu(self, index):
         """Show context menu for song tiles"""
@@ -716,76 +2037,255 @@ class MusicPlayer(QWidget):
         menu.exec_(QCursor.pos())
 
     def populate_browse_lists(self):
-        """Populate browse lists with categories"""
-        self.artist_list.clear()
-        self.album_list.clear()
-        self.genre_list.clear()
-        
-        if not self.songs:
+        """Populate browse lists with categories, counting only songs the other filters allow"""
+        if self.tabs.currentWidget() is not self.browse_tab:
+            self.browse_dirty = True
+            return
+        self.browse_dirty = False
+        self.populate_saved_searches()
+
+        for field, browse_list in self.browse_lists.items():
+            within = self.facet_restriction(field)
+            selected = self.facet_selection[field]
+            scroll = browse_list.verticalScrollBar().value()
+            browse_list.blockSignals(True)
+            browse_list.setUpdatesEnabled(False)
+            browse_list.clear()
+            for value, count in self.facet_index.counts(field, within):
+                if not count and value not in selected:
+                    continue
+                item = QListWidgetItem(f"{value} ({count})")
+                item.setData(Qt.UserRole, value)
+                browse_list.addItem(item)
+                item.setSelected(value in selected)
+            browse_list.setUpdatesEnabled(True)
+            browse_list.blockSignals(False)
+            browse_list.verticalScrollBar().setValue(scroll)
+
+        chosen = [", ".join(sorted(values, key=sort_key)) for values in self.facet_selection.values() if values]
+        if chosen:
+            self.facet_summary.setText(f"Showing {len(self.filtered_songs)} songs for {' + '.join(chosen)}")
+        else:
+            self.facet_summary.setText("Select artists, albums and genres to combine them; the search bar applies too")
+
+    def refresh_browse_lists(self):
+        """Rebuild the Browse lists if something changed since they were built"""
+        if self.browse_dirty:
+            self.populate_browse_lists()
+
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.browse_tab:
+            self.refresh_browse_lists()
+
+    def populate_saved_searches(self):
+        """List saved searches with how many songs each matches right now"""
+        self.saved_search_list.clear()
+        for name, text in sorted(self.saved_searches.items()):
+            ids = SearchQuery(text).run(self.search_index)
+            count = len(self.songs) if ids is None else len(ids)
+            item = QListWidgetItem(f"{name} ({count})")
+            item.setData(Qt.UserRole, name)
+            item.setToolTip(text)
+            self.saved_search_list.addItem(item)
+
+    def save_search(self):
+        """Save the current search bar query under a name"""
+        text = self.search_bar.text().strip()
+        if not text:
+            QMessageBox.warning(self, "Error", "Type a search to save first!")
+            return
+        name, ok = QInputDialog.getText(self, "Save Search", "Enter a name for this search:", text=text)
+        name = name.strip()
+        if ok and name:
+            self.saved_searches[name] = text
+            self.populate_saved_searches()
+            self.save_settings()
+
+    def apply_saved_search(self, item):
+        """Use a saved search as the library filter"""
+        text = self.saved_searches.get(item.data(Qt.UserRole))
+        if text is None:
+            return
+        self.search_bar.setText(text)
+        self.search_timer.stop()
+        self.apply_filter()
+        self.tabs.setCurrentWidget(self.library_tab)
+
+    def delete_saved_search(self, item):
+        """Forget a saved search"""
+        self.saved_searches.pop(item.data(Qt.UserRole), None)
+        self.populate_saved_searches()
+        self.save_settings()
+
+    def show_saved_search_context_menu(self, pos):
+        """Show context menu for saved searches"""
+        item = self.saved_search_list.itemAt(pos)
+        if not item:
+            return
+
+        menu = QMenu(self)
+        apply_action = QAction("🔍 Show Songs", self)
+        apply_action.triggered.connect(lambda: self.apply_saved_search(item))
+        menu.addAction(apply_action)
+
+        delete_action = QAction("🗑️ Delete", self)
+        delete_action.triggered.connect(lambda: self.delete_saved_search(item))
+        menu.addAction(delete_action)
+
+        menu.exec_(QCursor.pos())
+
+    def schedule_search(self):
+        """Restart the typing-pause timer, cancelling any grid build still pending"""
+        self.grid_generation += 1
+        self.search_timer.start()
+
+    def invalidate_search(self):
+        """Forget the last result set after the library changed"""
+        self.search_query = None
+        self.search_results = None
+        self.search_bits = None
+
+    def numbers_changed(self, field):
+        """Forget what was derived from a numeric field after a track changed it, e.g. plays"""
+        self.search_index.numbers_changed(field)
+        if self.search_query is not None and any(clause[0] == field for clause in self.search_query.clauses):
+            self.invalidate_search()
+
+    def search_ids(self):
+        """Return ids matching the search bar query, or None when it is empty"""
+        query = SearchQuery(self.search_bar.text())
+        if self.search_query is not None and query.clauses == self.search_query.clauses:
+            return self.search_results
+        within = self.search_results if query.refines(self.search_query) else None
+        self.search_results = query.run(self.search_index, within)
+        self.search_query = query
+        self.search_bits = None
+        return self.search_results
+
+    def search_bitmap(self):
+        if self.search_bits is None:
+            self.search_bits = ids_to_bitmap(self.search_ids())
+        return self.search_bits
+
+    def facet_restriction(self, skip=None):
+        """Return ids allowed by the search and the Browse selections, or None for all"""
+        bits = None
+        for field, values in self.facet_selection.items():
+            if field != skip and values:
+                field_bits = self.facet_index.bitmap(field, values)
+                bits = field_bits if bits is None else bits & field_bits
+        search = self.search_ids()
+        if bits is None:
+            return search
+        if search is not None:
+            bits &= self.search_bitmap()
+        return bitmap_to_ids(bits)
+
+    def matches_filter(self, track, query):
+        """Check a single track against the search query and the Browse selections"""
+        for field, values in self.facet_selection.items():
+            if values and getattr(track, field) not in values:
+                return False
+        return query.matches(track)
+
+    def apply_filter(self):
+        """Show songs matching the search bar query and the Browse selections"""
+        self.show_sorted(self.facet_restriction())
+        # Not rebuilt right away: this may run inside a Browse list's own selection signal
+        self.browse_dirty = True
+        QTimer.singleShot(0, self.refresh_browse_lists)
+
+    def sort_order(self, index):
+        """Return the whole library in a sort_combo order, sorting only after it changed"""
+        if index == 0:
+            return self.songs
+        order = self.sort_orders.get(index)
+        if order is None:
+            key = operator.attrgetter(self.SORT_KEYS[index])
+            order = self.sort_orders[index] = sorted(self.songs, key=key, reverse=index == 4)
+        return order
+
+    def show_sorted(self, ids=None):
+        """Show the tracks with the given ids, or all tracks, in the current sort order"""
+        self.grid_generation += 1
+        order = self.sort_order(self.sort_combo.currentIndex())
+        if ids is None:
+            self.grid_build_ids = None
+            self.filtered_songs = order.copy()
+            self.populate_song_grid()
+            self.update_stats()
             return
-            
-        artists = sorted(set(s["artist"] for s in self.songs))
-        albums = sorted(set(s["album"] for s in self.songs))
-        genres = sorted(set(s["genre"] for s in self.songs))
-        
-        for artist in artists:
-            count = len([s for s in self.songs if s["artist"] == artist])
-            self.artist_list.addItem(f"{artist} ({count})")
-        
-        for album in albums:
-            count = len([s for s in self.songs if s["album"] == album])
-            self.album_list.addItem(f"{album} ({count})")
-        
-        for genre in genres:
-            count = len([s for s in self.songs if s["genre"] == genre])
-            self.genre_list.addItem(f"{genre} ({count})")
-
-    def apply_filter(self, text):
-        """Filter songs based on search text"""
-        text = text.lower()
-        self.filtered_songs = [
-            s for s in self.songs
-            if text in s["artist"].lower()
-            or text in s["album"].lower()
-            or text in s["genre"].lower()
-            or text in s["title"].lower()
-        ]
-        self.apply_sort(self.sort_combo.currentIndex())
+        self.grid_build_ids = ids
+        self.filtered_songs = []
+        self.populate_song_grid()
+        self.continue_grid_build(self.grid_generation, self.filtered_songs, iter(order), ids,
+                                 self.song_view.screenful())
+
+    def continue_grid_build(self, generation, songs, order, ids, wanted=0):
+        """Append the next slice of matching tracks to the grid"""
+        if generation != self.grid_generation:
+            return
+        if self.song_model.songs is not songs:  # The grid was repopulated from elsewhere
+            self.grid_build_ids = None
+            return
+        deadline = time.perf_counter() + self.GRID_SLICE
+        found = []
+        while True:
+            chunk = list(islice(order, self.GRID_CHUNK))
+            found.extend([t for t in chunk if t.id in ids])
+            finished = len(chunk) < self.GRID_CHUNK
+            if finished or (len(found) >= wanted and time.perf_counter() >= deadline):
+                break
+
+        if songs is self.filtered_songs:
+            self.extend_filtered(found)
+        else:
+            songs.extend(found)
+        self.song_model.rows_appended()
+        self.no_songs_label.setVisible(not songs and finished)
+        if finished:
+            self.grid_build_ids = None
+            self.update_stats()
+            return
+        if wanted:
+            self.update_stats()
+        QTimer.singleShot(0, lambda: self.continue_grid_build(generation, songs, order, ids))
 
     def apply_sort(self, index):
         """Sort filtered songs"""
-        if index == 1:  # Title
-            self.filtered_songs.sort(key=lambda x: x["title"].lower())
-        elif index == 2:  # Artist
-            self.filtered_songs.sort(key=lambda x: x["artist"].lower())
-        elif index == 3:  # Album
-            self.filtered_songs.sort(key=lambda x: x["album"].lower())
-        elif index == 4:  # Most Played
-            self.filtered_songs.sort(key=lambda x: x.get("plays", 0), reverse=True)
-        self.populate_song_grid()
-        self.update_stats()
+        ids = self.grid_build_ids
+        if ids is None:
+            ids = {s.id for s in self.filtered_songs}
+            if len(ids) == len(self.songs):
+                ids = None
+        self.show_sorted(ids)
 
     def clear_search(self):
         """Clear search and filters"""
         self.search_bar.clear()
+        self.search_timer.stop()
+        self.grid_generation += 1
+        self.invalidate_search()
+        self.facet_selection = {field: set() for field in FACET_FIELDS}
         self.filtered_songs = self.songs.copy()
         self.sort_combo.setCurrentIndex(0)
         self.populate_song_grid()
         self.update_stats()
+        self.populate_browse_lists()
 
     def filter_by(self, field):
-        """Filter by specific field from browse tab"""
-        item = self.sender().currentItem()
-        if not item:
-            return
-        value = item.text().rsplit(" (", 1)[0]  # Remove count
-        self.filtered_songs = [s for s in self.songs if s[field] == value]
-        self.populate_song_grid()
-        self.tabs.setCurrentWidget(self.library_tab)
-        self.update_stats()
-
-    def play_song(self, row=None):
-        """Play a song at the given index"""
+        """Use the values selected in a Browse list as a filter on that field"""
+        items = self.browse_lists[field].selectedItems()
+        self.facet_selection[field] = {item.data(Qt.UserRole) for item in items}
+        self.apply_filter()
+
+    def clear_facets(self):
+        """Drop all Browse selections, keeping the search"""
+        self.facet_selection = {field: set() for field in FACET_FIELDS}
+        self.apply_filter()
+
+    def play_song(self, row=None, handoff=False):
+        """Play a song at the given index, from the standby player if it is preloaded"""
         if row is None:
             return
         if row < 0 or row >= len(self.filtered_songs):
@@ -794,45 +2294,171 @@ class MusicPlayer(QWidget):
         self.current_index = row
         song = self.filtered_songs[row]
 
-        media = self.vlc_instance.media_new(song["file"])
-        self.player.set_media(media)
+        self.handoff_timer.stop()
+        self.fade_timer.stop()
+        if self.preloaded is song:
+            self.player, self.standby_player = self.standby_player, self.player
+            self.player_media, self.standby_media = self.standby_media, self.player_media
+            self.preloaded = None
+            if not handoff and self.standby_player.get_state() in (vlc.State.Playing, vlc.State.Paused):
+                self.standby_player.stop()
+        else:
+            handoff = False
+            if self.standby_player.get_state() in (vlc.State.Playing, vlc.State.Paused):
+                self.standby_player.stop()  # A crossfade still fading out
+            self.player_media = self.media_cache.get(song.file)
+            self.player.set_media(self.player_media)
+        self.change_pending = True
+        self.change_mark = None if handoff else time.perf_counter()
+        self.change_started = None
+        self.handoff_started = time.perf_counter() if handoff else None
+        if handoff and self.playback_mode == "crossfade":
+            self.player.audio_set_volume(0)
+            self.fade_length = self.crossfade_length(self.standby_player.get_length())
+            self.fade_started = time.perf_counter()
+            self.fade_timer.start()
+        else:
+            self.player.audio_set_volume(self.volume_slider.value())
         self.player.play()
-        self.player.audio_set_volume(self.volume_slider.value())
+        self.shuffle_next = None
 
         self.play_button.setText("⏸")
-        self.now_playing.setText(song['title'])
-        self.now_playing_artist.setText(f"{song['artist']} • {song['album']}")
+        self.now_playing.setText(song.title)
+        self.now_playing_artist.setText(f"{song.artist} • {song.album}")
         
         # Update album art
-        if song["art"]:
-            pixmap = QPixmap.fromImage(song["art"])
-            self.album_art_label.setPixmap(pixmap.scaled(70, 70, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        art = self.album_art_thumbnail(song, 70, 70)
+        if art:
+            self.album_art_label.setPixmap(QPixmap.fromImage(art))
         else:
             pixmap = QPixmap(70, 70)
             pixmap.fill(QColor("#3d3d3d"))
             self.album_art_label.setPixmap(pixmap)
         
         # Update favorite button
-        if song["file"] in self.favorites:
+        if song.file in self.favorites:
             self.favorite_btn.setText("💚")
             self.favorite_btn.setStyleSheet("background-color: #1db954;")
         else:
             self.favorite_btn.setText("❤")
             self.favorite_btn.setStyleSheet("")
         
-        self.timer.start()
+        self.position_ms = 0
+        self.position_at = time.perf_counter()
+        self.length_ms = 0
+        self.buffering = 100
+        self.update_queue_eta()
         
         # Track play count
-        song["plays"] = song.get("plays", 0) + 1
-        self.add_to_recent_plays(song["file"])
+        song.plays = song.plays + 1
+        self.numbers_changed("plays")
+        self.sort_orders.pop(4, None)
+        self.song_view.viewport().update()
+        self.add_to_recent_plays(song.file)
         
         if self.is_shuffle and row not in self.shuffle_history:
             self.shuffle_history.append(row)
+        self.preload_next()
+
+    @property
+    def filtered_songs(self):
+        """Songs currently shown in the library grid, in display order"""
+        return self._filtered_songs
+
+    @filtered_songs.setter
+    def filtered_songs(self, songs):
+        self._filtered_songs = songs
+        self._filtered_positions = None
+        self.filtered_duration = sum(map(operator.attrgetter("duration"), songs))
+
+    def filtered_position(self, track):
+        """Return the position of track in filtered_songs, or -1"""
+        if self._filtered_positions is None:
+            self._filtered_positions = {t: i for i, t in enumerate(self._filtered_songs)}
+        return self._filtered_positions.get(track, -1)
+
+    def extend_filtered(self, tracks):
+        """Append tracks to filtered_songs, keeping the position map current"""
+        start = len(self._filtered_songs)
+        self._filtered_songs.extend(tracks)
+        added = self._filtered_songs[start:]
+        self.filtered_duration += sum(map(operator.attrgetter("duration"), added))
+        if self._filtered_positions is not None:
+            for i, track in enumerate(added, start):
+                self._filtered_positions[track] = i
+
+    def duration_changed(self, track, old):
+        """Keep the running-time totals current after track's duration changed from old"""
+        delta = track.duration - old
+        self.library_duration += delta
+        if self.filtered_position(track) >= 0:
+            self.filtered_duration += delta
+
+    def reset_library(self):
+        """Empty the library and its indexes"""
+        self.songs = []
+        self.library_duration = 0
+        self.tracks_by_path = {}
+        self.next_track_id = 0
+        self.search_index = SearchIndex()
+        self.facet_index = FacetIndex()
+        self.sort_orders = {}  # sort_combo index -> cached library order
+
+    def add_tracks(self, tracks):
+        """Add tracks to the library and its indexes"""
+        self.songs.extend(tracks)
+        self.library_duration += sum(map(operator.attrgetter("duration"), tracks))
+        for track in tracks:
+            track.id = self.next_track_id
+            self.next_track_id += 1
+            self.tracks_by_path[track.file] = track
+            self.search_index.add(track)
+            self.facet_index.add(track)
+        self.sort_orders.clear()
+
+    def remove_tracks(self, paths):
+        """Remove tracks by file path from the library and its indexes"""
+        self.songs = [s for s in self.songs if s.file not in paths]
+        self.filtered_songs = [s for s in self.filtered_songs if s.file not in paths]
+        for path in paths:
+            track = self.tracks_by_path.pop(path)
+            self.library_duration -= track.duration
+            self.media_cache.discard(path)
+            self.search_index.remove(track)
+            self.facet_index.remove(track)
+        self.sort_orders.clear()
+
+    def update_track_metadata(self, track, entry):
+        """Change a track's tags in place, keeping the indexes current"""
+        self.media_cache.discard(track.file)
+        self.search_index.remove(track)
+        self.facet_index.remove(track)
+        old_duration = track.duration
+        track.update_metadata(entry)
+        self.duration_changed(track, old_duration)
+        self.search_index.add(track)
+        self.facet_index.add(track)
+        self.sort_orders.clear()
+
+    def playlist_tracks(self, name):
+        """Return the library tracks of a playlist, in playlist order"""
+        return [self.tracks_by_path[path] for path in self.playlists[name] if path in self.tracks_by_path]
+
+    def current_song(self):
+        """Return the song at current_index, or None"""
+        if 0 <= self.current_index < len(self.filtered_songs):
+            return self.filtered_songs[self.current_index]
+        return None
 
     def toggle_play_pause(self):
         """Toggle between play and pause"""
         if self.player.is_playing():
             self.player.pause()
+            self.handoff_timer.stop()
+            self.timer.stop()
+            self.position_ms = self.player.get_time()
+            if self.fade_timer.isActive():
+                self.finish_fade()
             self.play_button.setText("▶")
         else:
             if self.current_index == -1 and self.filtered_songs:
@@ -841,37 +2467,45 @@ class MusicPlayer(QWidget):
                 self.player.play()
                 self.play_button.setText("⏸")
 
-    def next_song(self):
-        """Play next song"""
+    def peek_next_index(self, at_end=False):
+        """Return the row next_song would play (or on_song_end, with at_end), or None"""
+        if at_end and self.repeat_mode == 2:
+            return self.current_index if self.current_song() else None
         # Check queue first
         if self.play_queue:
-            song_file = self.play_queue.pop(0)
-            self.update_queue_display()
-            song = next((s for s in self.songs if s["file"] == song_file), None)
-            if song and song in self.filtered_songs:
-                self.current_index = self.filtered_songs.index(song)
-                self.play_song(self.current_index)
-                return
-        
+            position = self.filtered_position(self.tracks_by_path.get(self.play_queue[0]))
+            if position >= 0:
+                return position
+
         if not self.filtered_songs:
-            return
-        
+            return None
+
         if self.is_shuffle:
-            unplayed = [i for i in range(len(self.filtered_songs)) if i not in self.shuffle_history]
-            if unplayed:
-                self.current_index = random.choice(unplayed)
-            else:
-                self.shuffle_history.clear()
-                self.current_index = random.randint(0, len(self.filtered_songs) - 1)
-        else:
-            if self.current_index < len(self.filtered_songs) - 1:
-                self.current_index += 1
-            elif self.repeat_mode == 1:
-                self.current_index = 0
-            else:
-                return
-        
-        self.play_song(self.current_index)
+            if self.shuffle_next is None or self.shuffle_next >= len(self.filtered_songs):
+                played = set(self.shuffle_history)
+                unplayed = [i for i in range(len(self.filtered_songs)) if i not in played]
+                if unplayed:
+                    self.shuffle_next = random.choice(unplayed)
+                else:
+                    self.shuffle_next = random.randint(0, len(self.filtered_songs) - 1)
+            return self.shuffle_next
+        if self.current_index < len(self.filtered_songs) - 1:
+            return self.current_index + 1
+        if self.repeat_mode == 1:
+            return 0
+        return None
+
+    def next_song(self, handoff=False):
+        """Play next song"""
+        row = self.peek_next_index()
+        if self.play_queue:
+            self.play_queue.pop(0)
+            self.update_queue_display()
+        if row is None:
+            return
+        if self.is_shuffle and len(self.shuffle_history) >= len(self.filtered_songs):
+            self.shuffle_history.clear()
+        self.play_song(row, handoff)
 
     def prev_song(self):
         """Play previous song"""
@@ -890,13 +2524,198 @@ class MusicPlayer(QWidget):
             self.current_index = len(self.filtered_songs) - 1
             self.play_song(self.current_index)
 
-    def on_song_end(self, event):
+    def on_song_end(self, player, value):
         """Handle song end event"""
+        if player is not self.player:
+            # The previous song playing out after a gapless handoff
+            if self.change_pending and self.change_mark is None:
+                self.change_mark = time.perf_counter()
+                self.record_change_latency()
+            self.preload_next()
+            return
         if self.repeat_mode == 2:  # Repeat one
             self.play_song(self.current_index)
         else:
             self.next_song()
 
+    def on_playback_started(self, player, value):
+        """Resume progress updates, and note when a newly started song begins playing"""
+        if player is self.player:
+            self.buffering = 100
+            self.position_ms = self.player.get_time()
+            self.position_at = time.perf_counter()
+            if self.length_ms <= 0:
+                self.length_ms = self.player.get_length()
+            self.schedule_handoff()
+            self.update_progress()
+        if player is self.player and self.change_pending and self.change_started is None:
+            self.change_started = time.perf_counter()
+            if self.handoff_started is not None:
+                # Learn how early to start the next preloaded song
+                took = self.change_started - self.handoff_started
+                self.handoff_lead = min(1.0, 0.7 * self.handoff_lead + 0.3 * took)
+            self.record_change_latency()
+
+    def on_time_changed(self, player, ms):
+        """Follow the playing position; update_progress extrapolates between reports"""
+        if player is self.player:
+            self.position_ms = ms
+            self.position_at = time.perf_counter()
+
+    def on_length_changed(self, player, ms):
+        """Take the song length once VLC knows it"""
+        if player is not self.player or ms <= 0:
+            return
+        self.length_ms = ms
+        song = self.current_song()
+        if song and not song.duration:
+            # No duration in the stream headers; learn it from playback
+            song.duration = ms / 1000
+            self.duration_changed(song, 0)
+            self.numbers_changed("duration")
+        self.schedule_handoff()
+        self.update_progress()
+
+    def on_buffering(self, player, percent):
+        """Remember how far the current song has buffered, shown by update_progress"""
+        if player is self.player:
+            self.buffering = percent
+
+    def on_playback_error(self, player, value):
+        """Skip a song VLC cannot play"""
+        media = player.get_media()
+        path = media.get_mrl() if media is not None else "?"
+        print(f"Error playing {path}")
+        if player is not self.player:
+            return  # A broken preloaded song errors again, and is skipped, when it is due
+        song = self.current_song()
+        if song:
+            self.media_cache.discard(song.file)
+        self.next_song()
+
+    def record_change_latency(self):
+        """Record the gap between two songs once both of its ends are known"""
+        if self.change_mark is None or self.change_started is None:
+            return
+        self.change_pending = False
+        self.change_latencies.append(max(0.0, self.change_started - self.change_mark))
+        self.update_mode_tooltip()
+
+    def preload_next(self):
+        """Open the song that plays next on the standby player (gapless and crossfade modes)"""
+        if self.playback_mode == "standard" or self.standby_player.is_playing():
+            return
+        row = self.peek_next_index(at_end=True)
+        song = None if row is None else self.filtered_songs[row]
+        if song is self.preloaded:
+            return
+        self.preloaded = None
+        if song is None:
+            return
+        # Repeat one: the playing media cannot be opened by both players at once
+        self.standby_media = self.media_cache.get_idle(song.file, self.player_media)
+        self.standby_player.set_media(self.standby_media)
+        self.preloaded = song
+
+    def schedule_handoff(self):
+        """Time the start of the preloaded song to meet the end of the current one"""
+        if self.playback_mode == "standard" or self.length_ms <= 0 or not self.player.is_playing():
+            self.handoff_timer.stop()
+            return
+        remaining = (self.length_ms - self.player.get_time()) / 1000 - self.handoff_time(self.length_ms)
+        if remaining > self.HANDOFF_PREPARE:
+            remaining -= self.HANDOFF_PREPARE
+        self.handoff_timer.start(max(0, int(remaining * 1000)))
+
+    def handoff_time(self, length):
+        """Seconds before the end of a song of length ms to start the next one"""
+        if self.playback_mode == "crossfade":
+            return self.crossfade_length(length)
+        return self.handoff_lead
+
+    def crossfade_length(self, length):
+        """The crossfade window in seconds, shortened for songs under twice its length"""
+        if length <= 0:
+            return self.crossfade_seconds
+        return min(self.crossfade_seconds, length / 2000)
+
+    def step_fade(self):
+        """Move both volumes one step along an equal-power crossfade"""
+        progress = (time.perf_counter() - self.fade_started) / self.fade_length
+        if progress >= 1:
+            self.finish_fade()
+            return
+        volume = self.volume_slider.value()
+        self.player.audio_set_volume(round(volume * math.sin(progress * math.pi / 2)))
+        self.standby_player.audio_set_volume(round(volume * math.cos(progress * math.pi / 2)))
+
+    def finish_fade(self):
+        """End a crossfade: the new song at full volume, the old one stopped"""
+        self.fade_timer.stop()
+        self.player.audio_set_volume(self.volume_slider.value())
+        if self.standby_player.is_playing():
+            self.standby_player.stop()
+        if self.change_pending and self.change_mark is None:
+            self.change_mark = time.perf_counter()
+            self.record_change_latency()
+        self.preload_next()
+
+    def hand_off(self):
+        """Start the preloaded song as the current one runs out"""
+        length = self.length_ms
+        if (length - self.player.get_time()) / 1000 > self.handoff_time(length) + 0.05:
+            # Woken early to check the preload, or seeked back since the timer was set
+            self.preload_next()
+            self.schedule_handoff()
+            return
+        row = self.peek_next_index(at_end=True)
+        if row is None or self.filtered_songs[row] is not self.preloaded:
+            return  # Plans changed; on_song_end picks the next song as usual
+        if self.repeat_mode == 2:
+            self.play_song(row, handoff=True)
+        else:
+            self.next_song(handoff=True)
+
+    def cycle_playback_mode(self):
+        """Switch between standard, gapless and crossfade playback"""
+        modes = list(self.PLAYBACK_MODES)
+        self.playback_mode = modes[(modes.index(self.playback_mode) + 1) % len(modes)]
+        self.settings["playback_mode"] = self.playback_mode
+        self.mode_button.setText(self.PLAYBACK_MODES[self.playback_mode])
+        self.crossfade_spin.setVisible(self.playback_mode == "crossfade")
+        if self.playback_mode == "standard":
+            self.preloaded = None
+        else:
+            self.preload_next()
+        self.schedule_handoff()
+        self.update_mode_tooltip()
+
+    def change_crossfade(self, seconds):
+        """Set the crossfade window"""
+        self.crossfade_seconds = seconds
+        self.settings["crossfade_seconds"] = seconds
+        self.schedule_handoff()
+
+    def update_mode_tooltip(self):
+        """Describe the playback mode and the latest track change latencies"""
+        tip = {
+            "standard": "Standard playback",
+            "gapless": "Gapless: the next song is preloaded",
+            "crossfade": "Crossfade: the next song fades in as this one fades out",
+        }[self.playback_mode]
+        if self.change_latencies:
+            latest = self.change_latencies[-1] * 1000
+            median = sorted(self.change_latencies)[len(self.change_latencies) // 2] * 1000
+            tip += f"\nTrack change: {latest:.0f} ms (median of last {len(self.change_latencies)}: {median:.0f} ms)"
+        cache = self.media_cache
+        tip += (f"\nMedia cache: {len(cache)} of {cache.max_items} held, {cache.released} released, "
+                f"{cache.hits} hits, {cache.misses} misses ({cache.hit_rate:.0%})")
+        latencies = sorted(self.vlc_events.latencies)
+        if latencies:
+            tip += (f"\nVLC events handled after {latencies[len(latencies) // 2] * 1000:.1f} ms "
+                    f"(median), {latencies[-1] * 1000:.1f} ms (worst of last {len(latencies)})")
+        self.mode_button.setToolTip(tip)
+
     def toggle_shuffle(self):
         """Toggle shuffle mode"""
         self.is_shuffle = self.shuffle_button.isChecked()
@@ -935,31 +2754,74 @@ class MusicPlayer(QWidget):
         else:
             self.volume_icon.setText("🔊")
 
+    def current_position(self):
+        """Playing position in ms, extrapolated from VLC's last report while playing"""
+        if not self.player.is_playing():
+            return self.position_ms
+        pos = self.position_ms + (time.perf_counter() - self.position_at) * 1000
+        return min(pos, self.length_ms) if self.length_ms > 0 else pos
+
+    def progress_visible(self):
+        """Whether the progress bar is on screen"""
+        return self.isVisible() and not self.isMinimized()
+
     def update_progress(self):
-        """Update progress bar and time labels"""
-        if not self.player:
+        """Update progress bar and time labels, then wait for the next visible change"""
+        length = self.length_ms
+        if length <= 0 or not self.progress_visible():
             return
-        length = self.player.get_length()
-        pos = self.player.get_time()
-
-        if length > 0:
+        pos = int(self.current_position())
+        steps = self.progress.maximum()
+        if not self.progress.isSliderDown():
             self.progress.blockSignals(True)
-            self.progress.setValue(int(pos / length * 1000))
+            self.progress.setValue(pos * steps // length)
             self.progress.blockSignals(False)
 
-            elapsed = self.format_time(pos // 1000)
-            total = self.format_time(length // 1000)
-            self.time_label_start.setText(elapsed)
-            self.time_label_end.setText(total)
+        elapsed = self.format_time(pos // 1000)
+        total = self.format_time(length // 1000)
+        self.time_label_start.setText(elapsed)
+        self.time_label_end.setText(total if self.buffering >= 100 else f"⏳ {self.buffering:.0f}%")
+
+        if self.player.is_playing():
+            # The slider moves every length / steps ms (or per pixel, if it is
+            # narrower than that), the elapsed label every second
+            step = length / min(steps, max(1, self.progress.width()))
+            wait = min(step - pos % step, 1000 - pos % 1000)
+            self.timer.start(max(self.PROGRESS_MIN_MS, int(wait) + 1))
 
     def seek_song(self):
         """Seek to position in song"""
-        if not self.player:
-            return
-        length = self.player.get_length()
-        if length > 0:
+        if self.length_ms > 0:
             val = self.progress.value() / 1000
-            self.player.set_time(int(val * length))
+            self.player.set_time(int(val * self.length_ms))
+            self.position_ms = int(val * self.length_ms)
+            self.position_at = time.perf_counter()
+            self.schedule_handoff()
+            self.update_progress()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.on_visibility_changed()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.on_visibility_changed()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.on_visibility_changed()
+
+    def on_visibility_changed(self):
+        """Stop following the playing position while the window is hidden or minimized"""
+        visible = self.progress_visible()
+        self.vlc_events.set_muted(vlc.EventType.MediaPlayerTimeChanged, not visible)
+        if visible:
+            self.position_ms = self.player.get_time()
+            self.position_at = time.perf_counter()
+            self.update_progress()
+        else:
+            self.timer.stop()
 
     def change_music_folder(self):
         """Change music folder and rescan"""
@@ -967,22 +2829,386 @@ class MusicPlayer(QWidget):
         if folder:
             global MUSIC_DIR
             MUSIC_DIR = folder
-            self.refresh_library()
-            QMessageBox.information(self, "Success", f"Loaded {len(self.songs)} songs from {folder}")
+            self.start_library_scan(("Success", "Loaded {count} songs from " + folder))
 
     def refresh_library(self):
         """Refresh music library"""
-        self.songs = scan_music_folder(MUSIC_DIR)
-        self.filtered_songs = self.songs.copy()
+        self.start_library_scan(("Refreshed", "Library updated with {count} songs"))
+
+    def start_library_scan(self, notify=None):
+        """Rescan the music folder in the background; notify is an optional (title, message) for the end"""
+        self.stop_library_scan()
+        self.unwatch_library()
+        self.scan_notify = notify
+        current = self.current_song()
+        if current is not None:
+            self.scan_current = current.file
+        self.current_index = -1
+        self.shuffle_history.clear()
+        self.shuffle_next = None
+        self.reset_library()
+        self.filtered_songs = []
+        self.invalidate_search()
         self.populate_song_grid()
         self.populate_browse_lists()
         self.update_stats()
-        QMessageBox.information(self, "Refreshed", f"Library updated with {len(self.songs)} songs")
+
+        self.scanner = LibraryScanner(MUSIC_DIR, self.library_index, self.scan_workers, self)
+        self.scanner.batch_ready.connect(self.on_scan_batch)
+        self.scanner.progress.connect(self.on_scan_progress)
+        self.scanner.scan_finished.connect(self.on_scan_finished)
+        self.scan_progress.setRange(0, 0)
+        self.scan_progress.show()
+        self.cancel_scan_button.show()
+        self.scanner.start()
+
+    def cancel_library_scan(self):
+        """Ask a running background scan to stop, keeping the songs found so far"""
+        if self.scanner is not None:
+            self.scanner.cancel()
+
+    def stop_library_scan(self):
+        """Stop a running background scan and discard its pending results"""
+        if self.scanner is None:
+            return
+        scanner = self.scanner
+        self.scanner = None
+        scanner.cancel()
+        scanner.wait()
+        scanner.deleteLater()
+
+    def on_scan_batch(self, batch):
+        """Add a batch of scanned songs to the library and the current view"""
+        if self.sender() is not self.scanner:
+            return
+        self.add_tracks(batch)
+        self.invalidate_search()
+        query = SearchQuery(self.search_bar.text())
+        self.extend_filtered(s for s in batch if self.matches_filter(s, query))
+        if self.scan_current in self.tracks_by_path:
+            self.current_index = self.filtered_position(self.tracks_by_path[self.scan_current])
+            self.scan_current = None
+        self.add_song_tiles()
+        self.update_stats()
+        if not self.browse_refresh_timer.isActive():
+            self.browse_refresh_timer.start()
+
+    def on_scan_progress(self, done, total):
+        """Update the scan progress indicator"""
+        if self.sender() is not self.scanner:
+            return
+        self.scan_progress.setRange(0, total)
+        self.scan_progress.setValue(done)
+
+    def on_scan_finished(self, completed):
+        """Finish a background scan"""
+        if self.sender() is not self.scanner:
+            return
+        self.scanner.deleteLater()
+        self.scanner = None
+        self.scan_current = None
+        self.scan_progress.hide()
+        self.cancel_scan_button.hide()
+        self.browse_refresh_timer.stop()
+        self.populate_browse_lists()
+        self.populate_playlist_list()
+        self.update_queue_display()
+        if self.sort_combo.currentIndex() != 0:
+            self.apply_sort(self.sort_combo.currentIndex())
+        self.update_stats()
+        if self.watch_library:
+            self.start_folder_walk(check_files=False)
+        if completed and self.scan_notify:
+            title, message = self.scan_notify
+            QMessageBox.information(self, title, message.format(count=len(self.songs)))
+
+    # === FOLDER WATCHING ===
+
+    def toggle_watch_library(self):
+        """Turn folder watching on or off"""
+        self.watch_library = self.watch_button.isChecked()
+        self.settings["watch_library"] = self.watch_library
+        if self.watch_library:
+            # Catch up on anything that changed while we were not watching
+            self.start_folder_walk(check_files=True, dir_mtimes=self.fs_dir_mtimes or {})
+        else:
+            self.unwatch_library()
+
+    def start_folder_walk(self, check_files, dir_mtimes=None):
+        """Walk the music folder in the background to watch its subfolders and find changed ones"""
+        if self.folder_walker is not None or self.scanner is not None or not os.path.isdir(MUSIC_DIR):
+            return
+        self.folder_walker = FolderWalker(MUSIC_DIR, self.library_index, check_files, dir_mtimes, self)
+        self.folder_walker.walked.connect(self.on_folder_walked)
+        self.folder_walker.start()
+
+    def stop_folder_walk(self):
+        """Stop a running folder walk and discard its results"""
+        if self.folder_walker is None:
+            return
+        walker = self.folder_walker
+        self.folder_walker = None
+        walker.cancel()
+        walker.wait()
+        walker.deleteLater()
+
+    def check_library_folders(self):
+        """Look for files edited in place and for changes in folders the watcher does not cover"""
+        if self.fs_dir_mtimes is not None:
+            self.start_folder_walk(check_files=True, dir_mtimes=self.fs_dir_mtimes)
+
+    def on_folder_walked(self, folders, changed, mtimes):
+        """Watch newly found folders a slice at a time and collect the changed ones"""
+        if self.sender() is not self.folder_walker:
+            return
+        self.folder_walker.deleteLater()
+        self.folder_walker = None
+        if not self.watch_library or self.scanner is not None:
+            return
+        self.fs_dir_mtimes = mtimes
+        watched = set(self.watcher.directories())
+        queued = set(self.fs_watch_queue)
+        self.fs_watch_queue.extend(f for f in folders
+                                   if f not in watched and f not in queued and f not in self.fs_unwatched)
+        if self.fs_watch_queue:
+            QTimer.singleShot(0, self.watch_next_folders)
+        for folder in changed:
+            self.on_library_dir_changed(folder)
+        if not self.fs_check_timer.isActive():
+            self.fs_check_timer.start()
+
+    def watch_next_folders(self):
+        """Add the next slice of queued folders to the watcher"""
+        chunk = self.fs_watch_queue[:self.FS_WATCH_CHUNK]
+        del self.fs_watch_queue[:self.FS_WATCH_CHUNK]
+        self.add_watched_folders(chunk)
+        if self.fs_watch_queue:
+            QTimer.singleShot(0, self.watch_next_folders)
+
+    def add_watched_folders(self, folders):
+        """Watch folders, leaving any the watcher refuses to the periodic check"""
+        if not folders:
+            return
+        failed = self.watcher.addPaths(folders)
+        if failed:
+            if not self.fs_unwatched:
+                print(f"Could not watch {len(failed)} folders; checking them every "
+                      f"{self.FS_CHECK_INTERVAL_MS // 1000} s instead")
+            self.fs_unwatched.update(failed)
+
+    def watch_new_folder(self, folder):
+        """Watch a folder that appeared in a watched one, with its subfolders"""
+        self.add_watched_folders([root for root, _, _ in os.walk(folder)])
+
+    def unwatch_library(self):
+        """Stop watching the music folder and drop pending changes"""
+        self.stop_folder_walk()
+        self.fs_check_timer.stop()
+        self.fs_watch_queue.clear()
+        self.fs_unwatched.clear()
+        paths = self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+        self.fs_pending_dirs.clear()
+        self.fs_flush_timer.stop()
+        self.fs_burst = None
+
+    def on_library_dir_changed(self, path):
+        """Collect a directory change, restarting the quiet period of the current burst"""
+        if not self.fs_pending_dirs:
+            self.fs_burst_started = time.monotonic()
+        self.fs_pending_dirs.add(path)
+        if time.monotonic() - self.fs_burst_started < self.FS_MAX_DELAY or not self.fs_flush_timer.isActive():
+            self.fs_flush_timer.start()
+
+    def apply_library_fs_changes(self):
+        """Apply a burst of folder changes to the in-memory library in one update"""
+        if self.fs_reader is not None:
+            self.fs_flush_timer.start()  # Try again once the previous burst is applied
+            return
+        dirs = self.fs_pending_dirs
+        self.fs_pending_dirs = set()
+        if not dirs or self.scanner is not None:
+            return
+
+        songs_by_dir = {}
+        for song in self.songs:
+            songs_by_dir.setdefault(os.path.dirname(song.file), {})[song.file] = song
+        watched = set(self.watcher.directories()) | self.fs_unwatched
+
+        removed = {}  # path -> song
+        added = {}  # path -> stat
+        changed = {}  # path -> (stat, song)
+        for folder in dirs:
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                # Folder deleted or moved away: everything below it is gone
+                prefix = folder + os.sep
+                for song_dir, dir_songs in songs_by_dir.items():
+                    if song_dir == folder or song_dir.startswith(prefix):
+                        removed.update(dir_songs)
+                stale = [d for d in watched if d == folder or d.startswith(prefix)]
+                self.fs_unwatched.difference_update(stale)
+                if stale:
+                    self.watcher.removePaths(stale)
+                continue
+
+            known = songs_by_dir.get(folder, {})
+            present = set()
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if entry.path not in watched:
+                            # New folder: watch it and pick up everything inside
+                            self.watch_new_folder(entry.path)
+                            for path in list_music_files(entry.path):
+                                added[path] = os.stat(path)
+                    elif entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                        present.add(entry.path)
+                        st = entry.stat()
+                        if entry.path not in known:
+                            added[entry.path] = st
+                        elif self.library_index.lookup(entry.path, st) is None:
+                            changed[entry.path] = (st, known[entry.path])
+                except OSError:
+                    continue
+            for path, song in known.items():
+                if path not in present:
+                    removed[path] = song
+
+        if len(added) + len(changed) > self.FS_RESCAN_THRESHOLD:
+            self.start_library_scan()
+            return
+
+        # A removed file reappearing with the same size and mtime was renamed or moved
+        removed_by_sig = {}
+        for path in removed:
+            entry = self.library_index.entries.get(path)
+            if entry:
+                removed_by_sig.setdefault((entry["size"], entry["mtime"]), []).append(path)
+
+        new_songs = []
+        to_read = []
+        for path, st in added.items():
+            candidates = removed_by_sig.get((st.st_size, st.st_mtime_ns))
+            if candidates:
+                old_song = removed[candidates.pop()]
+                entry = self.library_index.store(path, st, self.library_index.entries[old_song.file])
+                song = Track(path, entry, old_song.plays)
+                self.rename_song_references(old_song.file, path)
+                new_songs.append(song)
+                continue
+            to_read.append((path, st))
+        to_read.extend((path, st) for path, (st, _) in changed.items())
+
+        # Tags are read on a background thread; the burst is applied once they arrive
+        self.fs_burst = (new_songs, removed, changed)
+        self.fs_reader = MetadataReader(to_read, self)
+        self.fs_reader.files_read.connect(self.on_fs_files_read)
+        self.fs_reader.start()
+
+    def on_fs_files_read(self, results):
+        """Apply a burst of folder changes once the tags of its new and changed files are read"""
+        self.fs_reader.deleteLater()
+        self.fs_reader = None
+        if self.fs_burst is None:  # Dropped by a rescan or by turning watching off
+            return
+        new_songs, removed, changed = self.fs_burst
+        self.fs_burst = None
+
+        for path, st, meta, error in results:
+            if error is not None:
+                print(f"Error reading {path}: {error}")
+                continue
+            entry = self.library_index.store(path, st, meta)
+            if path in changed:
+                self.update_track_metadata(changed[path][1], entry)
+            else:
+                new_songs.append(Track(path, entry))
+
+        if not (removed or new_songs or changed):
+            return
+
+        for path in removed:
+            self.library_index.entries.pop(path, None)
+        if not self.index_save_timer.isActive():
+            self.index_save_timer.start()
+        self.apply_library_changes(new_songs, set(removed), rebuild=bool(changed))
+
+    def save_library_index(self):
+        """Write folder-watch changes to the library index"""
+        self.index_save_timer.stop()
+        if self.scanner is not None:
+            self.index_save_timer.start()  # Not while the scan thread is writing to it
+            return
+        try:
+            self.library_index.save()
+        except OSError as e:
+            print(f"Error saving library index: {e}")
+
+    def apply_library_changes(self, added, removed, rebuild=False):
+        """Add songs to and remove file paths from the library, refreshing every view (rebuild redraws the grid)"""
+        current = self.current_song()
+        building = self.grid_build_ids
+
+        if removed:
+            if building is not None:
+                building = building - {self.tracks_by_path[path].id for path in removed}
+            self.remove_tracks(removed)
+        self.add_tracks(added)
+        self.invalidate_search()
+        query = SearchQuery(self.search_bar.text())
+        matching = [s for s in added if self.matches_filter(s, query)]
+        if building is not None:
+            # A time-sliced grid build is still running: restart it over the changed library
+            self.show_sorted(building | {s.id for s in matching})
+        else:
+            self.extend_filtered(matching)
+
+        if current is not None:
+            self.current_index = self.filtered_position(current)
+        self.shuffle_history.clear()
+
+        if building is not None:
+            pass  # show_sorted already repopulated the grid
+        elif removed or rebuild:
+            self.populate_song_grid()
+        else:
+            self.add_song_tiles()
+        self.populate_browse_lists()
+        self.populate_favorites_list()
+        self.populate_playlist_list()
+        self.update_queue_display()
+        if self.current_playlist in self.playlists:
+            self.show_playlist_songs()
+
+    def rename_song_references(self, old_path, new_path):
+        """Point favorites, playlists, the queue and recent plays at a renamed file"""
+        for paths in [self.favorites, self.play_queue, self.recent_plays] + list(self.playlists.values()):
+            for i, path in enumerate(paths):
+                if path == old_path:
+                    paths[i] = new_path
+        self.save_playlists()
 
     def update_stats(self):
         """Update statistics display"""
-        self.stats_label.setText(f"📊 Showing {len(self.filtered_songs)} of {len(self.songs)} songs")
-        self.queue_status.setText(f"📜 Queue: {len(self.play_queue)} songs")
+        shown = self.format_time(self.filtered_duration)
+        total = self.format_time(self.library_duration)
+        self.stats_label.setText(f"📊 Showing {len(self.filtered_songs)} of {len(self.songs)} songs ({shown} of {total})")
+        self.queue_status.setText(f"📜 Queue: {len(self.play_queue)} songs ({self.format_time(self.queue_duration)})")
+
+        scan = self.library_index.stats
+        if scan:
+            self.stats_label.setToolTip(
+                f"Last scan: {scan.get('files', 0)} files in {scan.get('seconds', 0)}s\n"
+                f"{scan.get('parsed', 0)} parsed, {scan.get('reused', 0)} unchanged, "
+                f"{scan.get('pruned', 0)} removed\n"
+                f"Album art cache: {self.art_cache.used_bytes / 1048576:.1f} of "
+                f"{self.art_cache.max_bytes / 1048576:.0f} MB, "
+                f"{self.art_cache.hits} hits, {self.art_cache.misses} misses, "
+                f"{self.thumbnail_cache.created} thumbnails created"
+            )
 
     # === PLAYLIST FUNCTIONS ===
     
@@ -1006,7 +3232,8 @@ class MusicPlayer(QWidget):
         self.playlist_list.clear()
         for name in sorted(self.playlists.keys()):
             count = len(self.playlists[name])
-            self.playlist_list.addItem(f"{name} ({count} songs)")
+            total = sum(s.duration for s in self.playlist_tracks(name))
+            self.playlist_list.addItem(f"{name} ({count} songs • {self.format_time(total)})")
 
     def create_playlist(self):
         """Create new playlist"""
@@ -1063,11 +3290,15 @@ class MusicPlayer(QWidget):
     def load_playlist(self, item):
         """Load playlist songs"""
         self.current_playlist = item.text().rsplit(" (", 1)[0]
+        self.show_playlist_songs()
+
+    def show_playlist_songs(self):
+        """Show the songs of the current playlist"""
         self.playlist_songs_list.clear()
         for song_path in self.playlists[self.current_playlist]:
-            song = next((s for s in self.songs if s["file"] == song_path), None)
+            song = self.tracks_by_path.get(song_path)
             if song:
-                self.playlist_songs_list.addItem(f"{song['title']} - {song['artist']}")
+                self.playlist_songs_list.addItem(f"{song.title} - {song.artist}")
 
     def add_song_to_playlist(self):
         """Add songs to current playlist"""
@@ -1092,10 +3323,10 @@ class MusicPlayer(QWidget):
             search_text = search.text().lower()
             for song in self.songs:
                 if (not search_text or 
-                    search_text in song['title'].lower() or 
-                    search_text in song['artist'].lower()):
-                    item = QListWidgetItem(f"{song['title']} - {song['artist']}")
-                    item.setData(Qt.UserRole, song['file'])
+                    search_text in song.title.lower() or 
+                    search_text in song.artist.lower()):
+                    item = QListWidgetItem(f"{song.title} - {song.artist}")
+                    item.setData(Qt.UserRole, song.file)
                     song_list.addItem(item)
         
         search.textChanged.connect(populate_dialog)
@@ -1131,8 +3362,8 @@ class MusicPlayer(QWidget):
     def quick_add_to_playlist(self, playlist_name, song_index):
         """Quickly add song to playlist from context menu"""
         song = self.filtered_songs[song_index]
-        if song["file"] not in self.playlists[playlist_name]:
-            self.playlists[playlist_name].append(song["file"])
+        if song.file not in self.playlists[playlist_name]:
+            self.playlists[playlist_name].append(song.file)
             self.save_playlists()
             QMessageBox.information(self, "Success", f"Added to '{playlist_name}'!")
 
@@ -1153,12 +3384,11 @@ class MusicPlayer(QWidget):
             return
         idx = self.playlist_songs_list.row(item)
         song_path = self.playlists[self.current_playlist][idx]
-        song = next((s for s in self.songs if s["file"] == song_path), None)
+        song = self.tracks_by_path.get(song_path)
         if song:
-            self.filtered_songs = [s for s_path in self.playlists[self.current_playlist] 
-                                  for s in self.songs if s["file"] == s_path]
-            self.current_index = idx
-            self.play_song(idx)
+            self.filtered_songs = self.playlist_tracks(self.current_playlist)
+            self.current_index = self.filtered_position(song)
+            self.play_song(self.current_index)
 
     def play_entire_playlist(self):
         """Play all songs in current playlist"""
@@ -1166,8 +3396,7 @@ class MusicPlayer(QWidget):
             QMessageBox.warning(self, "Error", "Playlist is empty!")
             return
         
-        self.filtered_songs = [s for s_path in self.playlists[self.current_playlist] 
-                              for s in self.songs if s["file"] == s_path]
+        self.filtered_songs = self.playlist_tracks(self.current_playlist)
         self.current_index = 0
         self.play_song(0)
         self.tabs.setCurrentWidget(self.library_tab)
@@ -1195,22 +3424,22 @@ class MusicPlayer(QWidget):
         """Populate favorites list"""
         self.favorites_list.clear()
         for fav_path in self.favorites:
-            song = next((s for s in self.songs if s["file"] == fav_path), None)
+            song = self.tracks_by_path.get(fav_path)
             if song:
-                self.favorites_list.addItem(f"{song['title']} - {song['artist']}")
+                self.favorites_list.addItem(f"{song.title} - {song.artist}")
 
     def toggle_favorite(self):
         """Toggle favorite status of current song"""
-        if self.current_index < 0 or not self.filtered_songs:
+        song = self.current_song()
+        if song is None:
             return
         
-        song = self.filtered_songs[self.current_index]
-        if song["file"] in self.favorites:
-            self.favorites.remove(song["file"])
+        if song.file in self.favorites:
+            self.favorites.remove(song.file)
             self.favorite_btn.setText("❤")
             self.favorite_btn.setStyleSheet("")
         else:
-            self.favorites.append(song["file"])
+            self.favorites.append(song.file)
             self.favorite_btn.setText("💚")
             self.favorite_btn.setStyleSheet("background-color: #1db954;")
         
@@ -1220,8 +3449,8 @@ class MusicPlayer(QWidget):
     def add_to_favorites_by_index(self, index):
         """Add song to favorites by index"""
         song = self.filtered_songs[index]
-        if song["file"] not in self.favorites:
-            self.favorites.append(song["file"])
+        if song.file not in self.favorites:
+            self.favorites.append(song.file)
             self.populate_favorites_list()
             self.save_settings()
             QMessageBox.information(self, "Success", "Added to favorites!")
@@ -1249,10 +3478,11 @@ class MusicPlayer(QWidget):
         idx = self.favorites_list.row(item)
         if idx >= 0 and idx < len(self.favorites):
             song_path = self.favorites[idx]
-            song = next((s for s in self.songs if s["file"] == song_path), None)
-            if song and song in self.songs:
-                self.filtered_songs = [s for s in self.songs if s["file"] in self.favorites]
-                self.current_index = self.filtered_songs.index(song)
+            song = self.tracks_by_path.get(song_path)
+            if song:
+                self.filtered_songs = [self.tracks_by_path[path] for path in self.favorites
+                                       if path in self.tracks_by_path]
+                self.current_index = self.filtered_position(song)
                 self.play_song(self.current_index)
 
     def show_favorites_context_menu(self, pos):
@@ -1277,25 +3507,40 @@ class MusicPlayer(QWidget):
     def add_to_queue(self, index):
         """Add song to play queue"""
         song = self.filtered_songs[index]
-        if song["file"] not in self.play_queue:
-            self.play_queue.append(song["file"])
+        if song.file not in self.play_queue:
+            self.play_queue.append(song.file)
             self.update_queue_display()
-            QMessageBox.information(self, "Queue", f"Added '{song['title']}' to queue!")
+            QMessageBox.information(self, "Queue", f"Added '{song.title}' to queue!")
 
     def add_current_to_queue(self):
         """Add current song to queue"""
-        if self.current_index >= 0 and self.filtered_songs:
+        if self.current_song() is not None:
             self.add_to_queue(self.current_index)
 
     def update_queue_display(self):
         """Update queue list display"""
         self.queue_list.clear()
+        self.queue_duration = 0
         for song_path in self.play_queue:
-            song = next((s for s in self.songs if s["file"] == song_path), None)
+            song = self.tracks_by_path.get(song_path)
             if song:
-                self.queue_list.addItem(f"{song['title']} - {song['artist']}")
+                self.queue_list.addItem(f"{song.title} - {song.artist}  ({self.format_time(song.duration)})")
+                self.queue_duration += song.duration
+        self.update_queue_eta()
         self.update_stats()
 
+    def update_queue_eta(self):
+        """Show the queue's running time and when it will have finished playing"""
+        if not self.play_queue:
+            self.queue_summary.setText("")
+            return
+        remaining = self.queue_duration
+        song = self.current_song()
+        if song:
+            remaining += max(0, song.duration - self.current_position() / 1000)
+        ends = datetime.now() + timedelta(seconds=remaining)
+        self.queue_summary.setText(f"{self.format_time(self.queue_duration)} • ends at {ends:%H:%M}")
+
     def clear_queue(self):
         """Clear play queue"""
         self.play_queue.clear()
@@ -1312,9 +3557,9 @@ class MusicPlayer(QWidget):
         if idx >= 0 and idx < len(self.play_queue):
             song_path = self.play_queue.pop(idx)
             self.update_queue_display()
-            song = next((s for s in self.songs if s["file"] == song_path), None)
-            if song and song in self.filtered_songs:
-                self.current_index = self.filtered_songs.index(song)
+            position = self.filtered_position(self.tracks_by_path.get(song_path))
+            if position >= 0:
+                self.current_index = position
                 self.play_song(self.current_index)
 
     # === SETTINGS FUNCTIONS ===
@@ -1333,6 +3578,7 @@ class MusicPlayer(QWidget):
         """Save user settings"""
         self.settings["favorites"] = self.favorites
         self.settings["recent_plays"] = self.recent_plays
+        self.settings["saved_searches"] = self.saved_searches
         with open(SETTINGS_FILE, 'w') as f:
             json.dump(self.settings, f, indent=2)
 
@@ -1354,11 +3600,20 @@ class MusicPlayer(QWidget):
 
     def closeEvent(self, event):
         """Handle window close event"""
+        self.stop_library_scan()
+        self.unwatch_library()
+        self.thumbnail_pool.clear()
+        self.thumbnail_pool.waitForDone()
+        if self.fs_reader is not None:
+            self.fs_reader.wait()
+        if self.index_save_timer.isActive():
+            self.save_library_index()
         self.save_settings()
         event.accept()
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     player = MusicPlayer()
     player.show()
@@ -0,0 +1,357 @@
+"""Benchmarks for BoombaBox library operations
+
+Usage:
+    python benchmark.py scan [--sizes 1000 10000 100000] [--workers N]
+    python benchmark.py tags [--files 2000]
+    python benchmark.py memory [--tracks 200000]
+    python benchmark.py search [--sizes 10000 100000 300000]
+    python benchmark.py sort [--tracks 100000]
+    python benchmark.py playback [--tracks 10]
+"""
+import os
+import json
+import time
+import shutil
+import operator
+import argparse
+import tempfile
+import tracemalloc
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt5.QtGui import QImage, QColor
+from mutagen import File
+from mutagen.id3 import ID3, APIC
+
+import BoombaBox
+
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz frame header; each frame is 417 bytes
+MP3_FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+GENRES = ["House", "Hip-Hop", "R&B", "Electronic", "Jazz", "Soul", "Funk", "Pop"]
+
+
+def _syncsafe(n):
+    return bytes([(n >> 21) & 0x7f, (n >> 14) & 0x7f, (n >> 7) & 0x7f, n & 0x7f])
+
+
+def _id3_frame(frame_id, payload):
+    return frame_id.encode("ascii") + _syncsafe(len(payload)) + b"\x00\x00" + payload
+
+
+def _text_frame(frame_id, text):
+    return _id3_frame(frame_id, b"\x03" + text.encode("utf-8"))
+
+
+def make_cover_png(size=300):
+    """Encode a solid-colour PNG to embed as album art"""
+    image = QImage(size, size, QImage.Format_RGB32)
+    image.fill(QColor("#1db954"))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def make_library(folder, count, art_every=4, frames=40):
+    """Write count tagged MP3 files, one album folder per 12 tracks"""
+    cover = make_cover_png()
+    audio = MP3_FRAME * frames
+    for i in range(count):
+        album = i // 12
+        artist = album // 3
+        album_dir = os.path.join(folder, f"Artist {artist:05}", f"Album {album:06}")
+        if i % 12 == 0:
+            os.makedirs(album_dir, exist_ok=True)
+        frames_data = (
+            _text_frame("TIT2", f"Track {i % 12 + 1} of album {album}")
+            + _text_frame("TPE1", f"Artist {artist}")
+            + _text_frame("TALB", f"Album {album}")
+            + _text_frame("TCON", GENRES[artist % len(GENRES)])
+        )
+        if art_every and i % art_every == 0:
+            frames_data += _id3_frame("APIC", b"\x03image/png\x00\x03\x00" + cover)
+        tag = b"ID3\x04\x00\x00" + _syncsafe(len(frames_data)) + frames_data
+        with open(os.path.join(album_dir, f"{i % 12 + 1:02} Track.mp3"), "wb") as f:
+            f.write(tag + audio)
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def bench_scan(sizes, workers, keep=False):
+    """Compare serial, pooled and warm-index scans of synthetic libraries"""
+    print(f"{'files':>8} {'serial':>10} {f'pool x{workers}':>10} {'speedup':>8} {'warm':>10}")
+    for size in sizes:
+        root = tempfile.mkdtemp(prefix=f"boomba_bench_{size}_")
+        try:
+            make_library(root, size)
+            serial_songs, serial = timed(BoombaBox.scan_music_folder, root)
+            pool_songs, pooled = timed(BoombaBox.scan_music_folder, root, workers=workers)
+            assert [s.file for s in serial_songs] == [s.file for s in pool_songs]
+
+            index = BoombaBox.LibraryIndex(os.path.join(root, "index.json"))
+            BoombaBox.scan_music_folder(root, index, workers)
+            _, warm = timed(BoombaBox.scan_music_folder, root, index, workers)
+
+            print(f"{size:>8} {serial:>9.2f}s {pooled:>9.2f}s {serial / pooled:>7.1f}x {warm:>9.2f}s")
+            print(f"{'':>8} warm scan stats: {index.stats}")
+        finally:
+            if keep:
+                print(f"{'':>8} kept {root}")
+            else:
+                shutil.rmtree(root, ignore_errors=True)
+
+
+def legacy_read(path):
+    """The original two-pass reader: easy tags first, then ID3 again for the APIC frame"""
+    meta = File(path, easy=True)
+    art = None
+    tags = ID3(path)
+    for tag in tags.values():
+        if isinstance(tag, APIC):
+            art = tag.data
+            break
+    return meta.get("title"), meta.get("artist"), meta.get("album"), meta.get("genre"), art
+
+
+def bench_tags(count):
+    """Compare the two-pass reader with the single-pass read_song_metadata"""
+    root = tempfile.mkdtemp(prefix="boomba_bench_tags_")
+    try:
+        make_library(root, count)
+        paths = BoombaBox.list_music_files(root)
+        _, legacy = timed(lambda: [legacy_read(p) for p in paths])
+        _, single = timed(lambda: [BoombaBox.read_song_metadata(p) for p in paths])
+        print(f"{count} files: two-pass {legacy * 1e6 / count:.0f} us/file, "
+              f"single-pass {single * 1e6 / count:.0f} us/file ({single / legacy:.0%} of two-pass)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def synthetic_entries(count):
+    """Index entries for a synthetic library, with fresh string objects like json.load gives"""
+    entries = {}
+    for i in range(count):
+        album = i // 12
+        artist = album // 3
+        path = os.path.join("music", f"Artist {artist:05}", f"Album {album:06}", f"{i % 12 + 1:02} Track.mp3")
+        entries[path] = {
+            "title": f"Track {i % 12 + 1} of album {album}",
+            "artist": f"Artist {artist}",
+            "album": f"Album {album}",
+            "genre": GENRES[artist % len(GENRES)],
+            "art_hash": f"{album:040x}" if i % 4 == 0 else None,
+            "duration": 180.0 + i % 120,
+            "bitrate": 320000,
+            "sample_rate": 44100,
+        }
+        BoombaBox.add_track_keys(entries[path])
+    return json.loads(json.dumps(entries))
+
+
+def dict_record(path, entry):
+    """The original eight-key song dict"""
+    return {
+        "title": entry["title"],
+        "artist": entry["artist"],
+        "album": entry["album"],
+        "genre": entry["genre"],
+        "file": path,
+        "art_hash": entry["art_hash"],
+        "duration": entry.get("duration", 0),
+        "plays": 0
+    }
+
+
+def measure_records(count, build):
+    """Bytes retained per track by records built from entries that are then dropped"""
+    tracemalloc.start()
+    entries = synthetic_entries(count)
+    records = [build(path, entry) for path, entry in entries.items()]
+    del entries
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current / count
+
+
+def bench_memory(count):
+    """Compare memory per track of song dicts and Track records"""
+    before = measure_records(count, dict_record)
+    after = measure_records(count, BoombaBox.Track)
+    print(f"{count} tracks: dict {before:.0f} B/track, Track {after:.0f} B/track "
+          f"({after / before:.0%}), {(before - after) * count / 1048576:.1f} MB saved")
+
+
+SEARCH_QUERIES = ["album 12", "jazz", "artist 99", "of album", "tr", "track 3", "funk*", "zzz",
+                  "genre:jazz", 'artist:"artist 99"', "duration:>4:50", "album 12 -genre:jazz",
+                  '"of album 1*"', 'title:"track 1*"']
+
+
+def original_filter(songs, text):
+    """The filter the index replaced: lowercase every field of every song on each query"""
+    return [
+        s for s in songs
+        if text in s.artist.lower() or text in s.album.lower()
+        or text in s.genre.lower() or text in s.title.lower()
+    ]
+
+
+def bench_search(sizes, rounds=5):
+    """Compare per-query latency of the original filter, checking every track, and the index
+
+    The original filter only understood a single bare substring, so it is
+    timed for those queries alone.
+    """
+    for size in sizes:
+        tracks = [BoombaBox.Track(path, entry) for path, entry in synthetic_entries(size).items()]
+        index = BoombaBox.SearchIndex()
+
+        def build():
+            for i, track in enumerate(tracks):
+                track.id = i
+                index.add(track)
+        _, built = timed(build)
+        print(f"{size} tracks, index built in {built:.2f}s")
+        print(f"  {'query':<22} {'matches':>8} {'original':>10} {'per-track':>10} {'indexed':>10}")
+
+        for text in SEARCH_QUERIES:
+            query = BoombaBox.SearchQuery(text)
+            expected = {s.id for s in tracks if query.matches(s)}
+            assert query.run(index) == expected, text
+            _, linear = timed(lambda: [[s for s in tracks if query.matches(s)] for _ in range(rounds)])
+            _, indexed = timed(lambda: [BoombaBox.SearchQuery(text).run(index) for _ in range(rounds)])
+            linear /= rounds
+            indexed /= rounds
+            original = "-"
+            if len(query.clauses) == 1 and query.clauses[0] == (None, text, None, None, False) and "*" not in text:
+                _, elapsed = timed(lambda: [original_filter(tracks, text) for _ in range(rounds)])
+                original = f"{elapsed / rounds * 1e3:.2f}ms"
+            print(f"  {text:<22} {len(expected):>8} {original:>10} {linear * 1e3:>8.2f}ms {indexed * 1e3:>8.2f}ms")
+
+
+def bench_sort(count, rounds=5):
+    """Compare sorting by lowercasing in the key with sorting by cached sort keys"""
+    tracks = [BoombaBox.Track(path, entry) for path, entry in synthetic_entries(count).items()]
+    print(f"{count} tracks")
+    print(f"  {'field':<8} {'lower()':>10} {'peak':>9} {'cached':>10} {'peak':>9}")
+    for field in ("title", "artist", "album"):
+        results = []
+        for key in (lambda t: getattr(t, field).lower(), operator.attrgetter(field + "_key")):
+            tracemalloc.start()
+            _, elapsed = timed(lambda: [len(sorted(tracks, key=key)) for _ in range(rounds)])
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append((elapsed / rounds, peak))
+        (lower, lower_peak), (cached, cached_peak) = results
+        print(f"  {field:<8} {lower * 1e3:>8.1f}ms {lower_peak / 1048576:>7.1f}MB "
+              f"{cached * 1e3:>8.1f}ms {cached_peak / 1048576:>7.1f}MB")
+    titles = sorted((t.title for t in tracks[:12]), key=BoombaBox.sort_key)
+    print("  natural order:", ", ".join(titles))
+
+
+def wait_playing(player, timeout=5):
+    """Seconds until player reaches the Playing state"""
+    started = time.perf_counter()
+    while player.get_state() != BoombaBox.vlc.State.Playing:
+        if time.perf_counter() - started > timeout:
+            raise RuntimeError("track did not start")
+        time.sleep(0.001)
+    return time.perf_counter() - started
+
+
+def bench_playback(count):
+    """Compare track change latency of a cold open, a cached media and a preloaded standby player"""
+    vlc = BoombaBox.vlc
+    root = tempfile.mkdtemp(prefix="boomba_bench_playback_")
+    instance = vlc.Instance()
+    players = [instance.media_player_new(), instance.media_player_new()]
+    try:
+        make_library(root, count, frames=400)
+        paths = BoombaBox.list_music_files(root)
+        cold = []
+        for path in paths:
+            started = time.perf_counter()
+            players[0].set_media(instance.media_new(path))
+            players[0].play()
+            cold.append(time.perf_counter() - started + wait_playing(players[0]))
+        players[0].stop()
+
+        cache = BoombaBox.MediaCache(instance, count)
+        for path in paths:
+            cache.get(path)
+        time.sleep(0.5)  # Let the parses finish
+        cached = []
+        for path in paths:
+            started = time.perf_counter()
+            players[0].set_media(cache.get(path))
+            players[0].play()
+            cached.append(time.perf_counter() - started + wait_playing(players[0]))
+        players[0].stop()
+
+        preloaded = []
+        for path in paths:
+            media = instance.media_new(path)
+            media.parse_with_options(vlc.MediaParseFlag.local, 0)
+            players[1].set_media(media)
+            time.sleep(0.2)  # The current track keeps playing meanwhile
+            started = time.perf_counter()
+            players[1].play()
+            preloaded.append(time.perf_counter() - started + wait_playing(players[1]))
+            players[0].stop()
+            players.reverse()
+        players[0].stop()
+        print(f"{count} track changes: cold open {sum(cold) / count * 1e3:.0f}ms, "
+              f"cached media {sum(cached) / count * 1e3:.0f}ms ({cache.hit_rate:.0%} hits), "
+              f"preloaded {sum(preloaded) / count * 1e3:.0f}ms on average")
+    finally:
+        for player in players:
+            player.release()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BoombaBox benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan = sub.add_parser("scan", help="serial vs pooled vs warm-index library scan")
+    scan.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    scan.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    scan.add_argument("--keep", action="store_true", help="keep generated libraries")
+
+    tags = sub.add_parser("tags", help="two-pass vs single-pass tag reading")
+    tags.add_argument("--files", type=int, default=2000)
+
+    memory = sub.add_parser("memory", help="memory per track of song dicts vs Track records")
+    memory.add_argument("--tracks", type=int, default=200000)
+
+    search = sub.add_parser("search", help="linear vs indexed search latency")
+    search.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 300000])
+
+    sort = sub.add_parser("sort", help="lower() sort keys vs cached sort keys")
+    sort.add_argument("--tracks", type=int, default=100000)
+
+    playback = sub.add_parser("playback", help="cold vs cached vs preloaded track change latency")
+    playback.add_argument("--tracks", type=int, default=10)
+
+    args = parser.parse_args()
+    if args.command == "scan":
+        bench_scan(args.sizes, args.workers, args.keep)
+    elif args.command == "tags":
+        bench_tags(args.files)
+    elif args.command == "memory":
+        bench_memory(args.tracks)
+    elif args.command == "search":
+        bench_search(args.sizes)
+    elif args.command == "sort":
+        bench_sort(args.tracks)
+    elif args.command == "playback":
+        bench_playback(args.tracks)
+
+
+if __name__ == "__main__":
+    main()
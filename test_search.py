@@ -0,0 +1,131 @@
+"""Tests for BoombaBox library search
+
+Usage:
+    python -m unittest test_search
+"""
+import os
+import unittest
+
+import BoombaBox
+
+
+GENRES = ["House", "Hip-Hop", "R&B", "Jazz", "Soul", "Funk"]
+QUERIES = [
+    "album 12", "jazz", "artist 9", "of album", "tr", "track 3", "funk*", "zzz", "beyoncé",
+    "genre:jazz", 'artist:"artist 9"', 'artist:"artist 1*"', '"of album 1*"', 'title:"track 1*"',
+    "plays:>5", "plays:<=2", "duration:>3:30", "duration:=200", "album 12 -genre:jazz",
+    '-album:"beyonce"', "-jazz -funk", "-plays:>0", "track -title:remix", "title:", "plays:>",
+    "unknown:thing", "hip-hop", "r&b",
+]
+
+
+def make_tracks(count):
+    """A small library: twelve tracks per album, three albums per artist"""
+    tracks = []
+    for i in range(count):
+        album = i // 12
+        artist = album // 3
+        meta = BoombaBox.add_track_keys({
+            "title": f"Track {i % 12 + 1} of album {album}" + (" (Remix)" if i % 7 == 0 else ""),
+            "artist": "Beyoncé" if artist == 4 else f"Artist {artist}",
+            "album": f"Album {album}",
+            "genre": GENRES[artist % len(GENRES)],
+            "art_hash": None,
+            "duration": 180.0 + i % 60,
+        })
+        track = BoombaBox.Track(os.path.join("music", f"{i:04} Track.mp3"), meta, plays=i % 9)
+        track.id = i
+        tracks.append(track)
+    return tracks
+
+
+class SearchQueryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tracks = make_tracks(600)
+        self.index = BoombaBox.SearchIndex()
+        for track in self.tracks:
+            self.index.add(track)
+
+    def expected(self, query):
+        return {t.id for t in self.tracks if query.matches(t)}
+
+    def test_run_agrees_with_matches(self):
+        for text in QUERIES:
+            with self.subTest(text=text):
+                query = BoombaBox.SearchQuery(text)
+                if query:
+                    self.assertEqual(query.run(self.index), self.expected(query))
+                else:
+                    self.assertIsNone(query.run(self.index))
+
+    def test_run_within_leaves_within_alone(self):
+        within = {t.id for t in self.tracks if t.id % 2}
+        for text in QUERIES:
+            with self.subTest(text=text):
+                query = BoombaBox.SearchQuery(text)
+                given = set(within)
+                result = query.run(self.index, given)
+                self.assertEqual(given, within)
+                if query:
+                    self.assertEqual(result, self.expected(query) & within)
+
+    def test_refined_run_matches_fresh_run(self):
+        for old_text in QUERIES:
+            old = BoombaBox.SearchQuery(old_text)
+            for new_text in QUERIES:
+                new = BoombaBox.SearchQuery(new_text)
+                if not new.refines(old):
+                    continue
+                with self.subTest(old=old_text, new=new_text):
+                    self.assertEqual(new.run(self.index, old.run(self.index)), self.expected(new))
+
+    def test_refines(self):
+        def refines(new, old):
+            return BoombaBox.SearchQuery(new).refines(BoombaBox.SearchQuery(old))
+
+        self.assertTrue(refines("trac", "tra"))
+        self.assertTrue(refines("track 3", "track"))
+        self.assertTrue(refines("jazz track", "jazz"))
+        self.assertTrue(refines("artist:art", "artist:ar"))
+        self.assertTrue(refines("fun*", "fu*"))
+        self.assertTrue(refines("jazz -funk", "jazz -funk"))
+        self.assertFalse(refines("tra", "trac"))
+        self.assertFalse(refines("jazz", "jazz track"))
+        self.assertFalse(refines("title:track", "artist:track"))
+        self.assertFalse(refines("funk", "fu*"))
+        self.assertFalse(refines("jazz -funky", "jazz -funk"))
+        self.assertFalse(refines("plays:>6", "plays:>5"))
+        self.assertFalse(refines("jazz", ""))
+        self.assertFalse(BoombaBox.SearchQuery("jazz").refines(None))
+
+    def test_numbers_changed(self):
+        query = BoombaBox.SearchQuery("plays:>7")
+        before = query.run(self.index)
+        self.tracks[0].plays = 50
+        self.index.numbers_changed("plays")
+        self.assertEqual(query.run(self.index), before | {self.tracks[0].id})
+
+    def test_half_typed_queries(self):
+        self.assertEqual(BoombaBox.SearchQuery("jazz title:").clauses,
+                         BoombaBox.SearchQuery("jazz").clauses)
+        self.assertFalse(BoombaBox.SearchQuery("plays:>"))
+        self.assertEqual(BoombaBox.SearchQuery("unknown:thing").clauses,
+                         [(None, "unknown:thing", None, None, False)])
+
+
+class SortKeyTest(unittest.TestCase):
+
+    def test_numbers_by_value(self):
+        titles = ["Track 10", "Track 2", "Track 1", "Track 02b"]
+        self.assertEqual(sorted(titles, key=BoombaBox.sort_key), ["Track 1", "Track 2", "Track 02b", "Track 10"])
+
+    def test_case_accents_and_article(self):
+        self.assertEqual(BoombaBox.sort_key("The Beatles"), BoombaBox.sort_key("beatles"))
+        self.assertEqual(BoombaBox.sort_key("Beyoncé"), BoombaBox.sort_key("BEYONCE"))
+        self.assertEqual(BoombaBox.sort_key("  Daft   Punk "), BoombaBox.sort_key("daft punk"))
+        self.assertLess(BoombaBox.sort_key("Theory"), BoombaBox.sort_key("Zero"))
+
+
+if __name__ == "__main__":
+    unittest.main()